@@ -8,24 +8,23 @@ from typing import List, Dict, Any, Optional
 from collections import Counter
 
 from fastapi import APIRouter, Request
-from pydantic import BaseModel, Field, HttpUrl
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from pydantic import BaseModel, Field
 from bs4 import BeautifulSoup
 
 from app.config import settings
 from app.core.browser import browser_pool
+from app.models.requests import UrlStr
 from app.utils.logger import get_logger
+from app.utils.rate_limit import limiter
 
 logger = get_logger(__name__)
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
 
 class AnalyzeRequest(BaseModel):
     """Request model for page analysis."""
 
-    url: HttpUrl = Field(..., description="URL to analyze")
+    url: UrlStr = Field(..., description="URL to analyze")
     timeout: int = Field(
         default=30000,
         ge=5000,
@@ -4,18 +4,74 @@ Batch scraping endpoint for processing multiple URLs.
 
 import uuid
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+import redis
+import redis.asyncio
+from fastapi import APIRouter, HTTPException, Response
+from sqlalchemy import select
 
 from app.models.requests import BatchScrapeRequest
 from app.models.responses import JobResponse, JobStatusResponse
 from app.config import settings
-from app.db.models import BatchJob, get_session
+from app.db.models import BatchJob, BatchResult, get_session
 from app.workers.tasks import batch_scrape_task
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Identical batch submissions (same cache_key) within this window reuse the
+# job already queued instead of scraping everything twice. Keys live in Redis
+# so the window holds across API processes.
+BATCH_DEDUPE_WINDOW_SECONDS = 10
+BATCH_DEDUPE_KEY_PREFIX = "simplecrawl:batch_dedupe:"
+
+_redis_client: Optional[redis.asyncio.Redis] = None
+
+
+def _get_redis() -> redis.asyncio.Redis:
+    """Get the Redis client used for batch deduplication, creating it on first use."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.asyncio.from_url(settings.redis_url, socket_connect_timeout=2)
+    return _redis_client
+
+
+async def _claim_batch(cache_key: str, job_id: str) -> Optional[str]:
+    """
+    Reserve a batch cache key for a new job.
+
+    Args:
+        cache_key: Request cache key
+        job_id: Job identifier to store under the key
+
+    Returns:
+        The id of the job already holding the key, or None if the key was
+        claimed (or Redis is unavailable, in which case nothing is deduplicated)
+    """
+    key = BATCH_DEDUPE_KEY_PREFIX + cache_key
+    try:
+        client = _get_redis()
+        if await client.set(key, job_id, nx=True, ex=BATCH_DEDUPE_WINDOW_SECONDS):
+            return None
+        existing = await client.get(key)
+    except redis.RedisError as e:
+        logger.warning("batch_dedupe_unavailable", error=str(e))
+        return None
+    return existing.decode() if existing else None
+
+
+async def _release_batch(cache_key: str, job_id: str) -> None:
+    """Drop a claimed batch cache key if it still points at job_id."""
+    key = BATCH_DEDUPE_KEY_PREFIX + cache_key
+    try:
+        client = _get_redis()
+        if (await client.get(key)) == job_id.encode():
+            await client.delete(key)
+    except redis.RedisError as e:
+        logger.warning("batch_dedupe_release_failed", error=str(e))
+
 
 @router.post("/batch/scrape", response_model=JobResponse)
 async def start_batch_scrape(request: BatchScrapeRequest):
@@ -43,11 +99,23 @@ async def start_batch_scrape(request: BatchScrapeRequest):
     
     Returns a job ID that can be used with `GET /v1/batch/{job_id}` to check status.
     """
+    # Generate job ID
+    job_id = f"batch_{uuid.uuid4().hex[:16]}"
+    cache_key = request.cache_key
+    claimed = False
+
     try:
         logger.info("batch_scrape_request", url_count=len(request.urls))
         
-        # Generate job ID
-        job_id = f"batch_{uuid.uuid4().hex[:16]}"
+        existing_id = await _claim_batch(cache_key, job_id)
+        if existing_id is not None:
+            logger.info("batch_scrape_deduplicated", job_id=existing_id)
+            return JobResponse(
+                success=True,
+                id=existing_id,
+                status_url=f"/v1/batch/{existing_id}"
+            )
+        claimed = True
         
         # Create job in database
         db = get_session(settings.database_url)
@@ -59,7 +127,8 @@ async def start_batch_scrape(request: BatchScrapeRequest):
             failed=0,
             config={
                 "urls": [str(url) for url in request.urls],
-                "formats": request.formats
+                "formats": request.formats,
+                "screenshot_format": request.screenshot_format
             },
             created_at=datetime.utcnow()
         )
@@ -71,7 +140,7 @@ async def start_batch_scrape(request: BatchScrapeRequest):
         batch_scrape_task.delay(
             job_id,
             [str(url) for url in request.urls],
-            {"formats": request.formats}
+            {"formats": request.formats, "screenshot_format": request.screenshot_format}
         )
         
         logger.info("batch_scrape_job_created", job_id=job_id)
@@ -84,6 +153,9 @@ async def start_batch_scrape(request: BatchScrapeRequest):
     
     except Exception as e:
         logger.error("batch_scrape_request_failed", error=str(e))
+        if claimed:
+            # Don't hand later identical submissions a job that never started
+            await _release_batch(cache_key, job_id)
         return JobResponse(
             success=False,
             error={
@@ -104,8 +176,8 @@ async def get_batch_status(job_id: str):
     - `completed`: Number of completed URLs
     - `failed`: Number of failed URLs
     - `data`: Scrape results (when completed)
-    - `created_at`: Job creation time
-    - `completed_at`: Job completion time (when completed)
+    - `created_at`: Job creation time (Unix epoch milliseconds)
+    - `completed_at`: Job completion time (Unix epoch milliseconds, when completed)
     
     Example:
     ```
@@ -114,18 +186,27 @@ async def get_batch_status(job_id: str):
     """
     try:
         db = get_session(settings.database_url)
-        job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
-        db.close()
+        try:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+            results = db.execute(
+                select(BatchResult.result)
+                .where(BatchResult.job_id == job_id)
+                .order_by(BatchResult.id)
+            ).scalars().all() if job else []
+        finally:
+            db.close()
         
         if not job:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
         
-        # Extract results data
+        # Extract results data (older jobs stored them on the job row)
         data = None
-        if job.results and "data" in job.results:
+        if results:
+            data = list(results)
+        elif job.results and "data" in job.results:
             data = job.results["data"]
         
-        return JobStatusResponse(
+        status = JobStatusResponse(
             status=job.status,
             total=job.total,
             completed=job.completed,
@@ -135,6 +216,9 @@ async def get_batch_status(job_id: str):
             completed_at=job.completed_at,
             error=job.error
         )
+        # Serialize straight to JSON; going through response_model would
+        # dump, re-validate and re-serialize every result dict
+        return Response(content=status.model_dump_json(), media_type="application/json")
     
     except HTTPException:
         raise
@@ -4,7 +4,7 @@ Crawl endpoints for multi-page crawling.
 
 import uuid
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app.models.requests import CrawlRequest
@@ -62,6 +62,10 @@ async def start_crawl(request: CrawlRequest):
         
         # Generate job ID
         job_id = f"crawl_{uuid.uuid4().hex[:16]}"
+        scrape_options = (
+            request.scrape_options.model_dump(exclude_none=True)
+            if request.scrape_options else {}
+        )
         
         # Create job in database
         db = get_session(settings.database_url)
@@ -75,7 +79,7 @@ async def start_crawl(request: CrawlRequest):
             config={
                 "limit": request.limit,
                 "depth": request.depth,
-                "scrape_options": request.scrape_options or {},
+                "scrape_options": scrape_options,
                 "include_patterns": request.include_patterns or [],
                 "exclude_patterns": request.exclude_patterns or [],
                 "headers": request.headers
@@ -93,7 +97,7 @@ async def start_crawl(request: CrawlRequest):
             {
                 "limit": request.limit,
                 "depth": request.depth,
-                "scrape_options": request.scrape_options or {},
+                "scrape_options": scrape_options,
                 "include_patterns": request.include_patterns or [],
                 "exclude_patterns": request.exclude_patterns or [],
                 "headers": request.headers
@@ -131,8 +135,8 @@ async def get_crawl_status(job_id: str):
     - `completed`: Number of pages crawled
     - `failed`: Number of failed pages
     - `data`: Crawled page data (when completed)
-    - `created_at`: Job creation time
-    - `completed_at`: Job completion time (when completed)
+    - `created_at`: Job creation time (Unix epoch milliseconds)
+    - `completed_at`: Job completion time (Unix epoch milliseconds, when completed)
     
     Example:
     ```
@@ -152,7 +156,7 @@ async def get_crawl_status(job_id: str):
         if job.results and "data" in job.results:
             data = job.results["data"]
         
-        return JobStatusResponse(
+        status = JobStatusResponse(
             status=job.status,
             total=job.total,
             completed=job.completed,
@@ -162,6 +166,9 @@ async def get_crawl_status(job_id: str):
             completed_at=job.completed_at,
             error=job.error
         )
+        # Serialize straight to JSON; going through response_model would
+        # dump, re-validate and re-serialize every result dict
+        return Response(content=status.model_dump_json(), media_type="application/json")
     
     except HTTPException:
         raise
@@ -5,10 +5,11 @@ Health check endpoint for monitoring service status.
 import time
 from typing import Dict, Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 import redis
 
 from app.config import settings
+from app.utils import serialization
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +18,15 @@ router = APIRouter()
 # Track startup time
 startup_time = time.time()
 
+# The root payload never changes, so it is encoded once
+ROOT_INFO_BODY = serialization.dumps({
+    "name": "SimpleCrawl API",
+    "version": "1.0.0",
+    "description": "Self-hosted web scraping and data extraction API",
+    "docs": "/docs",
+    "health": "/v1/health"
+})
+
 
 @router.get("/health")
 async def health_check() -> Dict[str, Any]:
@@ -72,17 +82,11 @@ async def health_check() -> Dict[str, Any]:
 
 
 @router.get("/")
-async def root() -> Dict[str, str]:
+async def root() -> Response:
     """
     Root endpoint with API information.
     
     Returns:
-        API information
+        API information (pre-encoded JSON)
     """
-    return {
-        "name": "SimpleCrawl API",
-        "version": "1.0.0",
-        "description": "Self-hosted web scraping and data extraction API",
-        "docs": "/docs",
-        "health": "/v1/health"
-    }
+    return Response(content=ROOT_INFO_BODY, media_type="application/json")
@@ -2,7 +2,7 @@
 Map endpoint for discovering URLs on a website.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from app.models.requests import MapRequest
 from app.models.responses import MapResponse, LinkInfo
@@ -44,10 +44,13 @@ async def map_site(request: MapRequest):
         # Convert to LinkInfo objects
         link_infos = [LinkInfo(**link) for link in links]
         
-        return MapResponse(
+        map_response = MapResponse(
             success=True,
             links=link_infos
         )
+        # Serialize directly; the response_model pass would dump and
+        # re-validate every LinkInfo a second time
+        return Response(content=map_response.model_dump_json(), media_type="application/json")
     
     except Exception as e:
         logger.error("map_request_failed", url=str(request.url), error=str(e))
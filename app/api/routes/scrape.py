@@ -2,19 +2,22 @@
 Scrape endpoint for single URL scraping.
 """
 
-from fastapi import APIRouter, HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import asyncio
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 
 from app.config import settings
 from app.models.requests import ScrapeRequest
-from app.models.responses import ScrapeResponse, ScrapeData, ErrorResponse
-from app.core.scraper import scrape_url, SSRFBlockedError
+from app.models.responses import ScrapeResponse, ScrapeData
+from app.core.scraper import scrape_url, serialize_scrape_result, SSRFBlockedError
+from app.utils import serialization
+from app.utils.errors import error_response
 from app.utils.logger import get_logger
+from app.utils.rate_limit import limiter
 
 logger = get_logger(__name__)
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
 
 @router.post("/scrape", response_model=ScrapeResponse)
@@ -26,7 +29,7 @@ async def scrape(request: Request, scrape_request: ScrapeRequest):
     Supported formats:
     - `markdown`: Clean, LLM-ready markdown
     - `html`: Raw HTML content
-    - `screenshot`: Full-page PNG screenshot (base64 encoded)
+    - `screenshot`: Full-page PNG or JPEG screenshot (base64 encoded, see `screenshot_format`)
     - `links`: All URLs found on the page
     - `metadata`: Page metadata (title, description, OG tags, etc.)
     - `media`: Downloaded media files (images)
@@ -62,34 +65,49 @@ async def scrape(request: Request, scrape_request: ScrapeRequest):
             exclude_tags=scrape_request.exclude_tags,
             wait_for_selector=scrape_request.wait_for_selector,
             timeout=scrape_request.timeout,
-            actions=scrape_request.actions,
+            actions=(
+                [action.model_dump(exclude_none=True) for action in scrape_request.actions]
+                if scrape_request.actions else None
+            ),
             wait_until=scrape_request.wait_until,
-            headers=scrape_request.headers
+            headers=scrape_request.headers,
+            screenshot_format=scrape_request.screenshot_format
         )
 
-        return ScrapeResponse(
-            success=True,
-            data=ScrapeData(**data)
+        response_headers = None
+        if data.get("screenshot") is not None or data.get("images"):
+            # Base64 of multi-MB screenshots/document images shouldn't block other requests
+            data = await asyncio.to_thread(serialize_scrape_result, data)
+            # Already-compressed image data barely shrinks; skip GZipMiddleware
+            response_headers = {"Content-Encoding": "identity"}
+
+        # Stream the ScrapeResponse body so large html/markdown fields are
+        # encoded in slices rather than as one full-size JSON copy
+        body = {
+            "success": True,
+            "data": ScrapeData(**data).model_dump(mode="json"),
+            "error": None
+        }
+        return StreamingResponse(
+            serialization.iter_json(body),
+            media_type="application/json",
+            headers=response_headers
         )
 
     except SSRFBlockedError as e:
         logger.warning("ssrf_blocked", url=str(scrape_request.url), error=str(e))
-        return ScrapeResponse(
-            success=False,
-            error={
-                "code": "SSRF_BLOCKED",
-                "message": "URL blocked by security policy",
-                "url": str(scrape_request.url)
-            }
+        return error_response(
+            "SSRF_BLOCKED",
+            "URL blocked by security policy",
+            envelope={"data": None},
+            url=str(scrape_request.url)
         )
 
     except Exception as e:
         logger.error("scrape_request_failed", url=str(scrape_request.url), error=str(e))
-        return ScrapeResponse(
-            success=False,
-            error={
-                "code": "SCRAPE_FAILED",
-                "message": str(e),
-                "url": str(scrape_request.url)
-            }
+        return error_response(
+            "SCRAPE_FAILED",
+            str(e),
+            envelope={"data": None},
+            url=str(scrape_request.url)
         )
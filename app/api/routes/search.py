@@ -3,19 +3,19 @@ Search endpoint for web search + scrape functionality.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.config import settings
 from app.core.search import search_and_scrape, SearchError
+from app.models.requests import ScrapeFormat
 from app.models.responses import SearchScrapeResponse, SearchResult, ScrapeData
+from app.utils.errors import error_response
 from app.utils.logger import get_logger
+from app.utils.rate_limit import limiter
 
 logger = get_logger(__name__)
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
 
 class SearchScrapeRequest(BaseModel):
@@ -33,7 +33,7 @@ class SearchScrapeRequest(BaseModel):
         le=20,
         description="Maximum number of results to scrape (1-20)"
     )
-    formats: List[str] = Field(
+    formats: List[ScrapeFormat] = Field(
         default=["markdown", "metadata"],
         description="Output formats for scraping"
     )
@@ -103,33 +103,28 @@ async def search_scrape(request: Request, search_request: SearchScrapeRequest):
                 error=r.get("error")
             ))
 
-        return SearchScrapeResponse(
+        search_response = SearchScrapeResponse(
             success=True,
             query=search_request.query,
             result_count=len(search_results),
             results=search_results
         )
+        # Already validated above; serialize directly instead of letting the
+        # response_model pass dump and re-validate every scraped page
+        return Response(content=search_response.model_dump_json(), media_type="application/json")
 
     except SearchError as e:
         logger.error("search_failed", query=search_request.query, error=str(e))
-        return SearchScrapeResponse(
-            success=False,
-            query=search_request.query,
-            result_count=0,
-            error={
-                "code": "SEARCH_FAILED",
-                "message": str(e)
-            }
+        return error_response(
+            "SEARCH_FAILED",
+            str(e),
+            envelope={"query": search_request.query, "result_count": 0, "results": None}
         )
 
     except Exception as e:
         logger.error("search_scrape_failed", query=search_request.query, error=str(e))
-        return SearchScrapeResponse(
-            success=False,
-            query=search_request.query,
-            result_count=0,
-            error={
-                "code": "SEARCH_SCRAPE_FAILED",
-                "message": str(e)
-            }
+        return error_response(
+            "SEARCH_SCRAPE_FAILED",
+            str(e),
+            envelope={"query": search_request.query, "result_count": 0, "results": None}
         )
@@ -3,6 +3,8 @@ Configuration management for SimpleCrawl using pydantic-settings.
 All settings are loaded from environment variables with sensible defaults.
 """
 
+import os
+from functools import cached_property
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,10 +20,14 @@ class Settings(BaseSettings):
     )
     
     # Server settings
+    env: str = "production"  # "development" enables auto-reload in `python -m app.main`
     host: str = "0.0.0.0"
     port: int = 8000
-    workers: int = 4
+    workers: int = 4  # API processes for `python -m app.main` outside development
     log_level: str = "INFO"
+    threadpool_size: int = min(64, (os.cpu_count() or 1) * 8)  # Threads for blocking calls in the API
+    markdown_pool_workers: int = min(4, os.cpu_count() or 1)  # Markdown conversion processes per API/worker process
+    pdf_pool_workers: int = min(2, os.cpu_count() or 1)  # PDF text extraction processes per API/worker process
     
     # Redis settings
     redis_url: str = "redis://localhost:6379/0"
@@ -54,30 +60,54 @@ class Settings(BaseSettings):
     max_concurrent_requests: int = 10
     job_retention_hours: int = 24
     request_timeout_seconds: int = 30
+    static_fetch_enabled: bool = True  # Try plain HTTP before launching a browser page
     
     # Browser settings
     headless: bool = True
     user_agent: str = "SimpleCrawl/1.0 (https://github.com/simplecrawl)"
     browser_pool_size: int = 5
+    context_max_pages: int = 50  # Pages served before a pooled context is recycled
+    context_max_age_seconds: int = 300  # Age after which a pooled context is recycled
+    # Abort images/fonts/styles/trackers when no format needs them. Routing requests
+    # disables the browser HTTP cache for the page; set false to keep the cache.
+    block_resources: bool = True
+    blocked_hosts: str = ""  # Extra comma-separated hosts to abort requests to
     
     # Media settings
     media_storage_dir: str = "/app/media"
     media_formats: str = "jpeg,jpg,png,gif,webp,avif,svg"
     max_media_size_mb: int = 50
+    max_document_size_mb: int = 50  # PDF/DOCX downloads larger than this are rejected
     
     # Rate limiting
     rate_limit_requests: int = 100
     rate_limit_period_seconds: int = 60
+    trust_forwarded_for: bool = False  # Key rate limits on X-Forwarded-For (only behind a trusted proxy)
     
     @property
     def media_formats_list(self) -> list[str]:
         """Get media formats as a list."""
         return [fmt.strip().lower() for fmt in self.media_formats.split(",")]
     
+    @cached_property
+    def media_formats_set(self) -> frozenset[str]:
+        """Get media formats as a set for membership checks (built once)."""
+        return frozenset(self.media_formats_list)
+    
+    @property
+    def blocked_hosts_list(self) -> list[str]:
+        """Get extra blocked hosts as a list."""
+        return [host.strip().lower() for host in self.blocked_hosts.split(",") if host.strip()]
+    
     @property
     def max_media_size_bytes(self) -> int:
         """Get max media size in bytes."""
         return self.max_media_size_mb * 1024 * 1024
+    
+    @property
+    def max_document_size_bytes(self) -> int:
+        """Get max document size in bytes."""
+        return self.max_document_size_mb * 1024 * 1024
 
 
 # Global settings instance
@@ -3,6 +3,7 @@ Playwright browser pool management for efficient browser reuse.
 """
 
 import asyncio
+import time
 from typing import Optional, Dict
 from contextlib import asynccontextmanager
 
@@ -37,6 +38,9 @@ class BrowserPool:
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._contexts: list[BrowserContext] = []
+        # Pooled context -> (created_at, pages_served), used to recycle
+        # long-lived contexts before they accumulate too much state
+        self._context_usage: Dict[BrowserContext, list] = {}
         self._lock = asyncio.Lock()
         self._initialized = False
         self._proxy_pool: Optional[ProxyPool] = None
@@ -74,6 +78,7 @@ class BrowserPool:
                 logger.warning("context_close_failed", error=str(e))
         
         self._contexts.clear()
+        self._context_usage.clear()
         
         # Close browser
         if self._browser:
@@ -85,6 +90,60 @@ class BrowserPool:
         
         self._initialized = False
         logger.info("browser_pool_closed")
+
+    def _context_options(
+        self,
+        proxy: Optional[Dict[str, str]] = None,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Dict:
+        """
+        Build Browser.new_context options for a dedicated context.
+
+        Args:
+            proxy: Playwright proxy settings
+            extra_headers: Custom HTTP headers
+
+        Returns:
+            Dict of context options
+        """
+        context_opts = {
+            "user_agent": self.user_agent,
+            "viewport": {'width': 1920, 'height': 1080},
+        }
+        if proxy:
+            context_opts["proxy"] = proxy
+        if extra_headers:
+            context_opts["extra_http_headers"] = extra_headers
+            logger.debug("using_custom_headers", header_count=len(extra_headers))
+        return context_opts
+
+    def _is_context_expired(self, context: BrowserContext) -> bool:
+        """
+        Check whether a pooled context has served enough pages or lived long
+        enough that it should be closed instead of reused.
+
+        Args:
+            context: Pooled browser context
+
+        Returns:
+            bool: True if the context should be recycled
+        """
+        usage = self._context_usage.get(context)
+        if usage is None:
+            return True
+        created_at, pages_served = usage
+        return (
+            pages_served >= settings.context_max_pages
+            or time.monotonic() - created_at >= settings.context_max_age_seconds
+        )
+
+    async def _discard_context(self, context: BrowserContext) -> None:
+        """Close a pooled context and forget its usage stats."""
+        self._context_usage.pop(context, None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning("context_close_failed", error=str(e))
     
     @asynccontextmanager
     async def get_context(self, use_proxy: bool = True, extra_headers: Optional[Dict[str, str]] = None):
@@ -113,30 +172,23 @@ class BrowserPool:
 
         # When using proxies or custom headers, always create a new context (can't reuse)
         if proxy or extra_headers:
-            context_opts = {
-                "user_agent": self.user_agent,
-                "viewport": {'width': 1920, 'height': 1080},
-            }
-            if proxy:
-                context_opts["proxy"] = proxy
-            if extra_headers:
-                context_opts["extra_http_headers"] = extra_headers
-                logger.debug("using_custom_headers", header_count=len(extra_headers))
-
-            context = await self._browser.new_context(**context_opts)
+            context = await self._browser.new_context(**self._context_options(proxy, extra_headers))
             logger.debug("context_created_with_options", proxy=bool(proxy), headers=bool(extra_headers))
         else:
             # No proxy or headers - use pooled contexts
+            context = None
             async with self._lock:
                 if self._contexts:
                     context = self._contexts.pop()
                     logger.debug("context_reused", pool_size=len(self._contexts))
-                else:
-                    context = await self._browser.new_context(
-                        user_agent=self.user_agent,
-                        viewport={'width': 1920, 'height': 1080}
-                    )
-                    logger.debug("context_created", pool_size=len(self._contexts))
+            if context is None:
+                context = await self._browser.new_context(
+                    user_agent=self.user_agent,
+                    viewport={'width': 1920, 'height': 1080}
+                )
+                self._context_usage[context] = [time.monotonic(), 0]
+                logger.debug("context_created", pool_size=len(self._contexts))
+            self._context_usage[context][1] += 1
 
         try:
             yield context
@@ -154,20 +206,53 @@ class BrowserPool:
                 # Always close contexts with proxy or custom headers (can't reuse)
                 await context.close()
                 logger.debug("custom_context_closed", proxy=bool(proxy), headers=bool(extra_headers))
+            elif self._is_context_expired(context):
+                await self._discard_context(context)
+                logger.debug("context_recycled", pool_size=len(self._contexts))
             else:
                 # Return standard context to pool
+                try:
+                    await context.clear_cookies()
+                except Exception:
+                    pass
                 async with self._lock:
                     if len(self._contexts) < self.pool_size:
-                        try:
-                            await context.clear_cookies()
-                        except Exception:
-                            pass
                         self._contexts.append(context)
-                        logger.debug("context_returned", pool_size=len(self._contexts))
+                        returned = True
                     else:
-                        await context.close()
-                        logger.debug("context_closed_pool_full", pool_size=len(self._contexts))
+                        returned = False
+                if returned:
+                    logger.debug("context_returned", pool_size=len(self._contexts))
+                else:
+                    await self._discard_context(context)
+                    logger.debug("context_closed_pool_full", pool_size=len(self._contexts))
     
+    @asynccontextmanager
+    async def get_batch_context(self, extra_headers: Optional[Dict[str, str]] = None):
+        """
+        Get dedicated browser contexts for a whole batch job.
+
+        Pages in the batch share a context, so cookies carry over between
+        same-origin URLs. The context is rotated after the same page count
+        and age limits as pooled contexts, and every context is closed when
+        the batch finishes rather than returned to the pool.
+
+        Args:
+            extra_headers: Custom HTTP headers for every page in the batch
+
+        Yields:
+            BatchContexts: Hands out a context for each page
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        contexts = BatchContexts(self, extra_headers)
+        try:
+            yield contexts
+        finally:
+            await contexts.close()
+            logger.debug("batch_contexts_closed")
+
     @asynccontextmanager
     async def get_page(self, extra_headers: Optional[Dict[str, str]] = None):
         """
@@ -187,9 +272,110 @@ class BrowserPool:
                 await page.close()
 
 
+class BatchContexts:
+    """
+    Browser contexts for one batch job.
+
+    Each page borrows the current context; once it has served
+    CONTEXT_MAX_PAGES pages or is CONTEXT_MAX_AGE_SECONDS old, later pages
+    get a fresh context (and proxy, when rotation is enabled) and the old
+    one is closed when its last page finishes.
+    """
+
+    def __init__(self, pool: BrowserPool, extra_headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the batch contexts.
+
+        Args:
+            pool: Browser pool whose browser creates the contexts
+            extra_headers: Custom HTTP headers for every page in the batch
+        """
+        self._pool = pool
+        self._extra_headers = extra_headers
+        self._current: Optional[BrowserContext] = None
+        self._created_at = 0.0
+        self._pages_served = 0
+        # Context -> (proxy server or None, pages still open in it)
+        self._open: Dict[BrowserContext, list] = {}
+        self._lock = asyncio.Lock()
+
+    def _is_current_expired(self) -> bool:
+        """Check whether the current context has hit the page or age limit."""
+        return (
+            self._pages_served >= settings.context_max_pages
+            or time.monotonic() - self._created_at >= settings.context_max_age_seconds
+        )
+
+    async def _close_context(self, context: BrowserContext) -> None:
+        """Close a batch context and forget its usage."""
+        self._open.pop(context, None)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning("context_close_failed", error=str(e))
+
+    @asynccontextmanager
+    async def page_context(self):
+        """
+        Borrow the batch context for one page.
+
+        Yields:
+            BrowserContext: The context to open the page in
+        """
+        retired = None
+        async with self._lock:
+            if self._current is None or self._is_current_expired():
+                retired = self._current
+                proxy_pool = self._pool._proxy_pool
+                proxy = None
+                if proxy_pool and proxy_pool.has_proxies:
+                    proxy = await proxy_pool.get_proxy()
+                self._current = await self._pool._browser.new_context(
+                    **self._pool._context_options(proxy, self._extra_headers)
+                )
+                self._created_at = time.monotonic()
+                self._pages_served = 0
+                self._open[self._current] = [proxy.get("server") if proxy else None, 0]
+                logger.debug("batch_context_created", proxy=bool(proxy), headers=bool(self._extra_headers))
+            context = self._current
+            self._pages_served += 1
+            self._open[context][1] += 1
+            if retired is not None and self._open[retired][1] == 0:
+                await self._close_context(retired)
+                logger.debug("batch_context_recycled")
+
+        proxy_server = self._open[context][0]
+        proxy_pool = self._pool._proxy_pool
+        try:
+            yield context
+        except Exception:
+            if proxy_server and proxy_pool:
+                await proxy_pool.report_failure(proxy_server)
+            raise
+        else:
+            if proxy_server and proxy_pool:
+                await proxy_pool.report_success(proxy_server)
+        finally:
+            async with self._lock:
+                usage = self._open.get(context)
+                if usage is not None:
+                    usage[1] -= 1
+                    if context is not self._current and usage[1] == 0:
+                        await self._close_context(context)
+                        logger.debug("batch_context_recycled")
+
+    async def close(self) -> None:
+        """Close every context the batch opened."""
+        async with self._lock:
+            for context in list(self._open):
+                await self._close_context(context)
+            self._current = None
+
+
 # Global browser pool instance
+# Sized so every concurrent batch/crawl request can hand its context back
 browser_pool = BrowserPool(
-    pool_size=settings.browser_pool_size,
+    pool_size=max(settings.browser_pool_size, settings.max_concurrent_requests),
     headless=settings.headless,
     user_agent=settings.user_agent
 )
@@ -2,7 +2,7 @@
 Multi-page crawling functionality.
 """
 
-import asyncio
+from contextlib import AsyncExitStack, nullcontext
 from typing import Dict, Any, List, Set
 from urllib.parse import urlparse, urljoin
 from datetime import datetime
@@ -11,7 +11,9 @@ import fnmatch
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.core.scraper import scrape_url
+from app.core.browser import browser_pool
+from app.core.loop import run_sync
+from app.core.scraper import scrape_url, serialize_scrape_result
 from app.db.models import CrawlJob, get_session
 from app.utils.logger import get_logger
 
@@ -79,16 +81,10 @@ def crawl_website(job_id: str, url: str, config: Dict[str, Any]) -> Dict[str, An
     """
     logger.info("crawl_started", job_id=job_id, url=url)
     
-    # Run async crawling
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        results = loop.run_until_complete(_crawl_async(job_id, url, config))
-        logger.info("crawl_completed", job_id=job_id, page_count=len(results))
-        return {"results": results}
-    finally:
-        loop.close()
+    # Run async crawling on the worker's shared loop
+    results = run_sync(_crawl_async(job_id, url, config))
+    logger.info("crawl_completed", job_id=job_id, page_count=len(results))
+    return {"results": results}
 
 
 async def _crawl_async(job_id: str, start_url: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -125,65 +121,82 @@ async def _crawl_async(job_id: str, start_url: str, config: Dict[str, Any]) -> L
     # Update job status
     update_job_status(db, job_id, "running", total=1)
     
-    while to_visit and len(results) < limit:
-        current_url, current_depth = to_visit.pop(0)
+    # Custom headers rule out pooled contexts, so rather than a new context
+    # per page, share batch contexts (rotated after CONTEXT_MAX_PAGES pages)
+    context_stack = AsyncExitStack()
+    
+    try:
+        contexts = None
+        if headers:
+            contexts = await context_stack.enter_async_context(
+                browser_pool.get_batch_context(extra_headers=headers)
+            )
+
+        while to_visit and len(results) < limit:
+            current_url, current_depth = to_visit.pop(0)
         
-        # Skip if already visited
-        if current_url in visited:
-            continue
+            # Skip if already visited
+            if current_url in visited:
+                continue
         
-        # Skip if depth exceeded
-        if current_depth > depth:
-            continue
+            # Skip if depth exceeded
+            if current_depth > depth:
+                continue
         
-        # Check URL patterns
-        if not should_crawl_url(current_url, include_patterns, exclude_patterns):
-            continue
+            # Check URL patterns
+            if not should_crawl_url(current_url, include_patterns, exclude_patterns):
+                continue
         
-        visited.add(current_url)
+            visited.add(current_url)
         
-        try:
-            # Scrape the page
-            formats = scrape_options.get("formats", ["markdown", "metadata"])
-            exclude_tags = scrape_options.get("exclude_tags")
+            try:
+                # Scrape the page
+                formats = scrape_options.get("formats", ["markdown", "metadata"])
+                exclude_tags = scrape_options.get("exclude_tags")
 
-            data = await scrape_url(current_url, formats, exclude_tags, headers=headers)
+                async with (contexts.page_context() if contexts else nullcontext()) as context:
+                    data = await scrape_url(
+                        current_url, formats, exclude_tags, headers=headers, context=context
+                    )
 
-            # Check content quality (bot challenges, empty pages, etc.)
-            is_valid, reject_reason = is_valid_content(data)
+                # Check content quality (bot challenges, empty pages, etc.)
+                is_valid, reject_reason = is_valid_content(data)
 
-            if is_valid:
-                # Add to results
-                results.append({
-                    "url": current_url,
-                    "depth": current_depth,
-                    **data
-                })
+                if is_valid:
+                    # Add to results
+                    results.append({
+                        "url": current_url,
+                        "depth": current_depth,
+                        **serialize_scrape_result(data)
+                    })
 
-                # Update job progress
-                update_job_status(
-                    db, job_id, "running",
-                    total=len(to_visit) + len(results),
-                    completed=len(results)
-                )
-            else:
-                # Log why the page was skipped
-                logger.info("page_skipped_junk_content", url=current_url, reason=reject_reason)
+                    # Update job progress
+                    update_job_status(
+                        db, job_id, "running",
+                        total=len(to_visit) + len(results),
+                        completed=len(results)
+                    )
+                else:
+                    # Log why the page was skipped
+                    logger.info("page_skipped_junk_content", url=current_url, reason=reject_reason)
 
-            # Extract links for next level (even from skipped pages - they may link to valid content)
-            if current_depth < depth and "links" in data:
-                for link in data["links"]:
-                    # Only crawl same domain
-                    if link.startswith(base_domain) and link not in visited:
-                        to_visit.append((link, current_depth + 1))
+                # Extract links for next level (even from skipped pages - they may link to valid content)
+                if current_depth < depth and "links" in data:
+                    for link in data["links"]:
+                        # Only crawl same domain
+                        if link.startswith(base_domain) and link not in visited:
+                            to_visit.append((link, current_depth + 1))
             
-        except Exception as e:
-            logger.error("crawl_page_failed", url=current_url, error=str(e))
-            # Update failed count
-            job = db.query(CrawlJob).filter(CrawlJob.id == job_id).first()
-            if job:
-                job.failed += 1
-                db.commit()
+            except Exception as e:
+                logger.error("crawl_page_failed", url=current_url, error=str(e))
+                # Update failed count
+                job = db.query(CrawlJob).filter(CrawlJob.id == job_id).first()
+                if job:
+                    job.failed += 1
+                    db.commit()
+    
+    finally:
+        await context_stack.aclose()
     
     # Mark job as completed
     update_job_status(
@@ -0,0 +1,62 @@
+"""
+Long-lived event loop for running async scraping code from sync callers.
+
+Celery tasks are synchronous. Running each one on a fresh event loop throws
+away the browser pool, pooled HTTP connections and anything else bound to the
+previous loop, so each worker process keeps a single loop running in a
+background thread and tasks submit their coroutines to it.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_pid: Optional[int] = None
+_worker_loop_lock = threading.Lock()
+
+
+def start_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Start the process-wide worker loop if it isn't running yet.
+
+    A loop inherited through fork has no thread driving it, so a new one is
+    started whenever the process id changes.
+
+    Returns:
+        The running worker event loop
+    """
+    global _worker_loop, _worker_loop_pid
+
+    with _worker_loop_lock:
+        if _worker_loop is None or _worker_loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="worker-event-loop", daemon=True
+            )
+            thread.start()
+            _worker_loop = loop
+            _worker_loop_pid = os.getpid()
+            logger.info("worker_loop_started", pid=_worker_loop_pid)
+        return _worker_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the worker loop and block until it finishes.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result (exceptions are re-raised)
+    """
+    loop = start_worker_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
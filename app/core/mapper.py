@@ -9,10 +9,8 @@ from urllib.parse import urljoin, urlparse
 # Use defusedxml to prevent XXE attacks
 import defusedxml.ElementTree as ET
 
-import httpx
-from bs4 import BeautifulSoup
-
 from app.core.browser import browser_pool
+from app.utils.http_client import get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -76,14 +74,14 @@ async def try_sitemap(base_url: str) -> List[Dict[str, Any]]:
         f"{base_url}/sitemap-index.xml"
     ]
     
-    async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-        for sitemap_url in sitemap_urls:
-            try:
-                response = await client.get(sitemap_url)
-                if response.status_code == 200:
-                    return parse_sitemap(response.text)
-            except Exception as e:
-                logger.debug("sitemap_fetch_failed", url=sitemap_url, error=str(e))
+    client = get_http_client()
+    for sitemap_url in sitemap_urls:
+        try:
+            response = await client.get(sitemap_url, timeout=10.0, follow_redirects=True)
+            if response.status_code == 200:
+                return parse_sitemap(response.text)
+        except Exception as e:
+            logger.debug("sitemap_fetch_failed", url=sitemap_url, error=str(e))
     
     return []
 
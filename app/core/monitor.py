@@ -2,17 +2,17 @@
 Content change monitoring functionality.
 """
 
-import asyncio
 import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db.models import Monitor, get_session
+from app.core.loop import run_sync
 from app.core.scraper import scrape_url
+from app.utils.http_client import get_http_client
 from app.utils.logger import get_logger
 from app.utils.url_validator import validate_webhook_url
 
@@ -31,16 +31,10 @@ def check_content_change(monitor_id: str) -> Dict[str, Any]:
     """
     logger.info("monitor_check_started", monitor_id=monitor_id)
     
-    # Run async check
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        result = loop.run_until_complete(_check_content_async(monitor_id))
-        logger.info("monitor_check_completed", monitor_id=monitor_id, changed=result.get("changed", False))
-        return result
-    finally:
-        loop.close()
+    # Run async check on the worker's shared loop
+    result = run_sync(_check_content_async(monitor_id))
+    logger.info("monitor_check_completed", monitor_id=monitor_id, changed=result.get("changed", False))
+    return result
 
 
 async def _check_content_async(monitor_id: str) -> Dict[str, Any]:
@@ -124,19 +118,18 @@ async def send_webhook_notification(
         return
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            payload = {
-                "event": "content_changed",
-                "url": page_url,
-                "old_hash": old_hash,
-                "new_hash": new_hash,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            response = await client.post(webhook_url, json=payload)
-            response.raise_for_status()
-            
-            logger.info("webhook_sent", webhook_url=webhook_url, status=response.status_code)
+        payload = {
+            "event": "content_changed",
+            "url": page_url,
+            "old_hash": old_hash,
+            "new_hash": new_hash,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+        response = await get_http_client().post(webhook_url, json=payload, timeout=10.0)
+        response.raise_for_status()
+        
+        logger.info("webhook_sent", webhook_url=webhook_url, status=response.status_code)
     
     except Exception as e:
         logger.error("webhook_failed", webhook_url=webhook_url, error=str(e))
@@ -6,26 +6,29 @@ Also handles document parsing (PDF, DOCX) via direct download.
 
 import asyncio
 import base64
-from typing import Dict, Any, List, Optional
-from urllib.parse import urljoin, urlparse
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+from urllib.parse import urljoin, urlsplit
 
-import httpx
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
-from bs4 import BeautifulSoup
+import lxml.html
+from playwright.async_api import BrowserContext, Page, Route, TimeoutError as PlaywrightTimeout
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.core.browser import browser_pool
+from app.core.browser import BatchContexts, browser_pool
 from app.core.actions import execute_actions
-from app.utils.markdown import html_to_markdown, html_to_markdown_smart
+from app.core.loop import run_sync
+from app.db.models import BatchJob, BatchResult, get_session
+from app.utils.markdown import html_to_markdown, html_to_markdown_smart_async
 from app.utils.media import extract_media
+from app.utils.parsing import ParsedPage
 from app.utils.logger import get_logger
 from app.utils.url_validator import validate_url
-from app.utils.documents import (
-    is_document_url,
-    parse_document_url,
-    DocumentParseError,
-    DOCUMENT_EXTENSIONS
-)
+from app.utils.documents import is_document_url
+from app.utils.http_client import get_http_client
 from app.utils.flaresolverr import (
     flaresolverr_client,
     is_cloudflare_challenge,
@@ -33,6 +36,139 @@ from app.utils.flaresolverr import (
 
 logger = get_logger(__name__)
 
+# Formats that need images/lazy content loaded before capture, and so a live
+# browser page (the static HTTP path can't serve them)
+_FULL_LOAD_FORMATS = ("screenshot", "media")
+
+# Analytics and ad hosts that keep the network busy without affecting content
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "mixpanel.com",
+    "scorecardresearch.com",
+    "amazon-adsystem.com",
+    "clarity.ms",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+# Matches a request URL whose host is a tracker host (or one configured via
+# BLOCKED_HOSTS) or one of its subdomains
+_TRACKER_RE = re.compile(
+    r"^[a-z]+://(?:[^/?#]*\.)?(?:"
+    + "|".join(map(re.escape, TRACKER_HOSTS + tuple(settings.blocked_hosts_list)))
+    + r")(?:[:/?#]|$)",
+    re.IGNORECASE,
+)
+
+# Static HTML whose visible text is below this share of the markup is treated
+# as a client-rendered shell and re-fetched with the browser
+STATIC_MIN_TEXT_RATIO = 0.05
+_EMPTY_APP_ROOT_XPATH = (
+    "//div[@id='root' or @id='app' or @id='__next' or @id='__nuxt']"
+    "[not(*) and not(normalize-space())]"
+)
+# Body text a reader would see; inline scripts (often large JSON state in
+# app shells) and styles don't count
+_VISIBLE_TEXT_XPATH = (
+    "//body//text()[not(ancestor::script or ancestor::style"
+    " or ancestor::noscript or ancestor::template)]"
+)
+
+# JPEG quality for screenshot_format="jpeg"
+SCREENSHOT_JPEG_QUALITY = 80
+
+# Resource types only needed when rendering screenshots or collecting media
+_VISUAL_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+# Stylesheets don't change the DOM, but actions and selector waits depend on
+# layout/visibility
+_STYLE_RESOURCE_TYPES = _VISUAL_RESOURCE_TYPES | {"stylesheet"}
+
+# Batch results are written to the job row in chunks of this size, or at
+# least this often while URLs are still in flight
+BATCH_FLUSH_SIZE = 100
+BATCH_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Document checks keyed by (scheme, host, path, query), and how much of the
+# body is fetched to sniff the file type
+CONTENT_TYPE_CACHE_SIZE = 10000
+CONTENT_SNIFF_BYTES = 1024
+_content_type_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _pick_wait_until(formats: List[str]) -> str:
+    """
+    Pick a page load strategy based on the requested formats.
+
+    Screenshots and media need lazy-loaded images, so they wait for network idle.
+    Markdown, HTML, links and metadata only need the DOM.
+
+    Args:
+        formats: Requested output formats
+
+    Returns:
+        Playwright wait_until value
+    """
+    if any(fmt in formats for fmt in _FULL_LOAD_FORMATS):
+        return "networkidle"
+    return "domcontentloaded"
+
+
+async def _abort_route(route: Route) -> None:
+    """Abort a routed request."""
+    await route.abort()
+
+
+async def _install_resource_blocking(
+    page: Page,
+    formats: List[str],
+    needs_layout: bool = False
+) -> None:
+    """
+    Abort tracker requests, and heavy visual resources when no format needs them.
+
+    Fewer live connections also lets load and networkidle fire sooner.
+    Stylesheets are blocked too unless page actions or wait_for_selector need
+    real layout: without CSS, elements the page hides count as visible.
+    Disabled entirely with BLOCK_RESOURCES=false.
+
+    Resource types can only be told apart per request, so blocking them routes
+    every subresource through a Python handler. When only trackers are blocked
+    (screenshot/media), the route is narrowed to tracker URLs. Either way,
+    Playwright disables the browser HTTP cache for a page with any route
+    installed.
+
+    Args:
+        page: Playwright page, before navigation
+        formats: Requested output formats
+        needs_layout: Whether page actions or a selector wait will run after navigation
+    """
+    if not settings.block_resources:
+        return
+
+    if any(fmt in formats for fmt in _FULL_LOAD_FORMATS):
+        # Nothing but trackers to block, so only tracker URLs hit the router
+        await page.route(_TRACKER_RE, _abort_route)
+        return
+
+    blocked_types = _VISUAL_RESOURCE_TYPES if needs_layout else _STYLE_RESOURCE_TYPES
+
+    async def _router(route: Route) -> None:
+        request = route.request
+        if request.resource_type in blocked_types or _TRACKER_RE.match(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", _router)
+
 
 class SSRFBlockedError(Exception):
     """Raised when a URL is blocked due to SSRF protection."""
@@ -51,8 +187,10 @@ async def scrape_url(
     wait_for_selector: Optional[str] = None,
     timeout: int = 30000,
     actions: Optional[List[Dict[str, Any]]] = None,
-    wait_until: str = "domcontentloaded",
-    headers: Optional[Dict[str, str]] = None
+    wait_until: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    screenshot_format: str = "png",
+    context: Optional[BrowserContext] = None
 ) -> Dict[str, Any]:
     """
     Scrape a single URL and return data in requested formats.
@@ -66,8 +204,13 @@ async def scrape_url(
         wait_for_selector: CSS selector to wait for
         timeout: Timeout in milliseconds
         actions: Page actions to execute (only for web pages)
-        wait_until: Page load strategy - "domcontentloaded" (fast), "load", or "networkidle" (slow but complete)
+        wait_until: Page load strategy - "domcontentloaded" (fast), "load", or "networkidle" (slow but complete).
+            Defaults to networkidle when screenshot/media is requested, domcontentloaded otherwise.
+            Setting it always renders the page in the browser (no static HTTP fetch).
         headers: Custom HTTP headers (e.g., Authorization, Cookie) for authenticated requests
+        screenshot_format: "png" or "jpeg"; JPEG encodes several times faster and is much smaller
+        context: Browser context to open the page in (e.g. a batch context); headers
+            are ignored when given, the context's own headers apply
 
     Returns:
         Dictionary with scraped data
@@ -83,108 +226,64 @@ async def scrape_url(
     # Check if URL is a document by extension first (fast path)
     is_doc, doc_type = is_document_url(url)
 
-    # If not obvious from extension, do a HEAD request to check content-type
+    # If not obvious from extension, check content-type and magic bytes
     if not is_doc:
         is_doc, doc_type = await _check_content_type(url, timeout)
 
     # Handle documents differently - use direct parsing instead of browser
     if is_doc:
         logger.info("document_detected", url=url, type=doc_type)
+        from app.utils.documents import parse_document_url, DocumentParseError
         try:
             return await parse_document_url(url, formats, timeout)
         except DocumentParseError as e:
             logger.error("document_parse_failed", url=url, error=str(e))
             raise DocumentError(f"Failed to parse document: {str(e)}")
 
-    result = {}
+    # Try a plain HTTP fetch first when nothing needs a live page. An explicit
+    # wait_until asks for browser load semantics, so it rules the fetch out too.
+    if (
+        settings.static_fetch_enabled
+        and wait_until is None
+        and not actions
+        and not wait_for_selector
+        and not any(fmt in formats for fmt in _FULL_LOAD_FORMATS)
+    ):
+        static = await _try_static(url, headers, timeout)
+        if static is not None:
+            html_content, response_headers = static
+            parsed = ParsedPage(html_content)
+            if _looks_rendered(parsed):
+                result = await _extract_from_html(
+                    parsed, url, formats, exclude_tags, 200, url, response_headers
+                )
+                logger.info("scrape_completed", url=url, method="static")
+                return result
+            logger.debug("static_fetch_needs_browser", url=url)
+
+    if wait_until is None:
+        wait_until = _pick_wait_until(formats)
+
+    page_kwargs = dict(
+        formats=formats,
+        exclude_tags=exclude_tags,
+        wait_for_selector=wait_for_selector,
+        timeout=timeout,
+        actions=actions,
+        wait_until=wait_until,
+        screenshot_format=screenshot_format,
+    )
 
     try:
-        async with browser_pool.get_page(extra_headers=headers) as page:
-            # Navigate to URL with configurable wait strategy
-            # domcontentloaded: Fast, good for most sites
-            # load: Wait for load event
-            # networkidle: Slow but waits for all network activity to stop
-            await page.goto(url, wait_until=wait_until, timeout=timeout)
-            
-            # Wait for specific selector if provided
-            if wait_for_selector:
-                await page.wait_for_selector(wait_for_selector, timeout=timeout)
-            
-            # Execute page actions if provided
-            if actions:
-                await execute_actions(page, actions)
-            
-            # Get HTML content
-            html_content = await page.content()
-
-            # Track if we used FlareSolverr (affects how we extract links/metadata)
-            used_flaresolverr = False
-
-            # Check for Cloudflare challenge and retry with FlareSolverr if available
-            if is_cloudflare_challenge(html_content):
-                logger.info("cloudflare_detected", url=url)
-
-                if settings.flaresolverr_auto_fallback and flaresolverr_client.is_available:
-                    logger.info("flaresolverr_fallback", url=url)
-                    try:
-                        fs_result = await flaresolverr_client.get(url)
-                        if fs_result.get("status") == "ok":
-                            html_content = fs_result["solution"]["response"]
-                            used_flaresolverr = True
-                            logger.info("flaresolverr_bypass_success", url=url)
-                        else:
-                            logger.warning(
-                                "flaresolverr_bypass_failed",
-                                url=url,
-                                message=fs_result.get("message"),
-                            )
-                    except Exception as e:
-                        logger.error("flaresolverr_error", url=url, error=str(e))
-                else:
-                    logger.warning(
-                        "cloudflare_no_fallback",
-                        url=url,
-                        message="FlareSolverr not available for bypass",
-                    )
-
-            # Extract markdown with smart extraction
-            if "markdown" in formats:
-                smart_result = html_to_markdown_smart(html_content, exclude_tags)
-                result["markdown"] = smart_result["markdown"]
-                result["quality_score"] = smart_result["quality_score"]
-                result["extraction_method"] = smart_result["method"]
-
-            # Get raw HTML
-            if "html" in formats:
-                result["html"] = html_content
-            
-            # Take screenshot
-            if "screenshot" in formats:
-                screenshot_bytes = await page.screenshot(full_page=True, type="png")
-                result["screenshot"] = base64.b64encode(screenshot_bytes).decode()
-            
-            # Extract links (use HTML parsing if FlareSolverr was used)
-            if "links" in formats:
-                if used_flaresolverr:
-                    result["links"] = extract_links_from_html(html_content, url)
-                else:
-                    result["links"] = await extract_links(page, url)
+        if context is not None:
+            page = await context.new_page()
+            try:
+                return await _scrape_on_page(page, url, **page_kwargs)
+            finally:
+                await page.close()
 
-            # Extract metadata (use HTML parsing if FlareSolverr was used)
-            if "metadata" in formats:
-                if used_flaresolverr:
-                    result["metadata"] = extract_metadata_from_html(html_content, url)
-                else:
-                    result["metadata"] = await extract_metadata(page, url)
-            
-            # Extract media
-            if "media" in formats:
-                import os
-                job_media_dir = os.path.join(settings.media_storage_dir, "scrape")
-                result["media"] = await extract_media(page, url, job_media_dir)
-            
-            logger.info("scrape_completed", url=url)
-            return result
+        async with browser_pool.get_page(extra_headers=headers) as page:
+            return await _scrape_on_page(page, url, **page_kwargs)
     
     except PlaywrightTimeout as e:
         logger.error("scrape_timeout", url=url, error=str(e))
@@ -194,137 +293,309 @@ async def scrape_url(
         raise
 
 
-async def extract_links(page: Page, base_url: str) -> List[str]:
+async def _extract_from_html(
+    parsed: ParsedPage,
+    url: str,
+    formats: List[str],
+    exclude_tags: Optional[List[str]],
+    status_code: int,
+    final_url: str,
+    response_headers: Dict[str, str]
+) -> Dict[str, Any]:
     """
-    Extract all links from a page.
-    
+    Build the formats that only need the page HTML (markdown, html, links, metadata).
+
     Args:
-        page: Playwright page
-        base_url: Base URL for resolving relative links
-    
+        parsed: Page HTML
+        url: Requested URL
+        formats: List of output formats
+        exclude_tags: HTML tags to exclude from markdown
+        status_code: HTTP status of the page
+        final_url: URL after redirects
+        response_headers: Response headers (lowercase names)
+
     Returns:
-        List of absolute URLs
-    """
-    links = await page.evaluate("""
-        () => {
-            const anchors = Array.from(document.querySelectorAll('a[href]'));
-            return anchors.map(a => a.href).filter(href => href && !href.startsWith('#'));
-        }
-    """)
-    
-    # Convert to absolute URLs and deduplicate
-    absolute_links = []
-    seen = set()
-    
-    for link in links:
-        absolute_link = urljoin(base_url, link)
-        if absolute_link not in seen:
-            seen.add(absolute_link)
-            absolute_links.append(absolute_link)
-    
-    return absolute_links
+        Dictionary with the HTML-derived formats
+    """
+    result = {}
 
+    # Extract markdown with smart extraction
+    if "markdown" in formats:
+        smart_result = await html_to_markdown_smart_async(parsed.raw_html, exclude_tags)
+        result["markdown"] = smart_result["markdown"]
+        result["quality_score"] = smart_result["quality_score"]
+        result["extraction_method"] = smart_result["method"]
+
+    # Get raw HTML
+    if "html" in formats:
+        result["html"] = parsed.raw_html
+
+    # Links and metadata are read from the HTML we already have
+    # instead of round-tripping to the browser
+    if "links" in formats:
+        result["links"] = _extract_links_lxml(parsed.tree, final_url)
+
+    if "metadata" in formats:
+        metadata = _extract_metadata_lxml(parsed.tree, url)
+        metadata["statusCode"] = status_code
+        metadata["finalURL"] = final_url
+        content_language = response_headers.get("content-language")
+        if not metadata["language"] and content_language:
+            # Header may list several languages ("en-US, fr"); keep the first
+            metadata["language"] = content_language.split(",")[0].strip()
+        if not metadata["language"]:
+            metadata["language"] = "en"
+        result["metadata"] = metadata
+
+    return result
+
+
+async def _try_static(
+    url: str,
+    headers: Optional[Dict[str, str]],
+    timeout: int
+) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    Fetch a page over plain HTTP, for pages that don't need a browser.
+
+    Redirects, non-200 responses, non-HTML content and Cloudflare challenges
+    all return None so the browser path (with its SSRF checks on the final
+    URL and FlareSolverr fallback) handles them.
 
-async def extract_metadata(page: Page, url: str) -> Dict[str, Any]:
+    Args:
+        url: URL to fetch
+        headers: Custom HTTP headers
+        timeout: Timeout in milliseconds
+
+    Returns:
+        Tuple of (html, lowercase response headers), or None to use the browser
     """
-    Extract page metadata.
-    
+    request_headers = {"User-Agent": settings.user_agent, **(headers or {})}
+    try:
+        response = await get_http_client().get(
+            url, headers=request_headers, follow_redirects=False, timeout=timeout / 1000
+        )
+    except Exception as e:
+        logger.debug("static_fetch_failed", url=url, error=str(e))
+        return None
+
+    if response.status_code != 200:
+        return None
+    if "text/html" not in response.headers.get("content-type", ""):
+        return None
+
+    html = response.text
+    if is_cloudflare_challenge(html):
+        return None
+    return html, {k.lower(): v for k, v in response.headers.items()}
+
+
+def _looks_rendered(parsed: ParsedPage) -> bool:
+    """
+    Guess whether server-rendered HTML already contains the page content.
+
     Args:
-        page: Playwright page
-        url: Page URL
-    
+        parsed: Page HTML
+
     Returns:
-        Dictionary with metadata
-    """
-    metadata = await page.evaluate("""
-        () => {
-            const getMeta = (name) => {
-                const meta = document.querySelector(`meta[name="${name}"], meta[property="${name}"]`);
-                return meta ? meta.content : null;
-            };
-            
-            return {
-                title: document.title || null,
-                description: getMeta('description') || getMeta('og:description'),
-                language: document.documentElement.lang || 'en',
-                keywords: getMeta('keywords'),
-                author: getMeta('author'),
-                ogTitle: getMeta('og:title'),
-                ogDescription: getMeta('og:description'),
-                ogImage: getMeta('og:image'),
-                ogUrl: getMeta('og:url'),
-                ogType: getMeta('og:type'),
-                ogSiteName: getMeta('og:site_name'),
-                twitterCard: getMeta('twitter:card'),
-                twitterTitle: getMeta('twitter:title'),
-                twitterDescription: getMeta('twitter:description'),
-                twitterImage: getMeta('twitter:image')
-            };
-        }
-    """)
-    
-    # Add source URL and status code
-    metadata["sourceURL"] = url
-    metadata["statusCode"] = 200  # If we got here, it's 200
+        False for pages that look like client-side app shells
+    """
+    tree = parsed.tree
+    if tree.find("body") is None:
+        return False
+    # Empty mount points of common SPA frameworks
+    if tree.xpath(_EMPTY_APP_ROOT_XPATH):
+        return False
+    text_length = len("".join(tree.xpath(_VISIBLE_TEXT_XPATH)).strip())
+    return text_length / max(len(parsed.raw_html), 1) > STATIC_MIN_TEXT_RATIO
+
+
+async def _scrape_on_page(
+    page: Page,
+    url: str,
+    formats: List[str],
+    exclude_tags: Optional[List[str]],
+    wait_for_selector: Optional[str],
+    timeout: int,
+    actions: Optional[List[Dict[str, Any]]],
+    wait_until: str,
+    screenshot_format: str
+) -> Dict[str, Any]:
+    """
+    Load a web page on an existing Playwright page and extract the requested formats.
 
-    return metadata
+    Args:
+        page: Playwright page to navigate (the caller owns and closes it)
+        url: URL to scrape
+        formats: List of output formats
+        exclude_tags: HTML tags to exclude from markdown
+        wait_for_selector: CSS selector to wait for
+        timeout: Timeout in milliseconds
+        actions: Page actions to execute
+        wait_until: Page load strategy
+        screenshot_format: "png" or "jpeg"
+
+    Returns:
+        Dictionary with scraped data
+    """
+    needs_full_load = any(fmt in formats for fmt in _FULL_LOAD_FORMATS)
+
+    await _install_resource_blocking(
+        page, formats, needs_layout=bool(actions or wait_for_selector)
+    )
+
+    # Navigate to URL with configurable wait strategy
+    # domcontentloaded: Fast, good for most sites
+    # load: Wait for load event
+    # networkidle: Slow but waits for all network activity to stop
+    response = await page.goto(url, wait_until=wait_until, timeout=timeout)
 
+    # Make sure images are loaded before screenshots/media on fast strategies
+    if needs_full_load and wait_until in ("commit", "domcontentloaded"):
+        await page.wait_for_load_state("load", timeout=timeout)
+
+    # Wait for specific selector if provided
+    if wait_for_selector:
+        await page.wait_for_selector(wait_for_selector, timeout=timeout)
+    
+    # Execute page actions if provided
+    if actions:
+        await execute_actions(page, actions)
+    
+    # Get HTML content
+    html_content = await page.content()
+
+    # Navigation details for metadata (replaced if FlareSolverr fetches the page)
+    if response is not None:
+        status_code = response.status
+        final_url = response.url
+        response_headers = response.headers
+    else:
+        status_code, final_url, response_headers = 200, page.url, {}
+
+    # Check for Cloudflare challenge and retry with FlareSolverr if available
+    if is_cloudflare_challenge(html_content):
+        logger.info("cloudflare_detected", url=url)
+
+        if settings.flaresolverr_auto_fallback and flaresolverr_client.is_available:
+            logger.info("flaresolverr_fallback", url=url)
+            try:
+                fs_result = await flaresolverr_client.get(url)
+                if fs_result.get("status") == "ok":
+                    solution = fs_result["solution"]
+                    html_content = solution["response"]
+                    status_code = solution.get("status", 200)
+                    final_url = solution.get("url", url)
+                    response_headers = {
+                        k.lower(): v for k, v in (solution.get("headers") or {}).items()
+                    }
+                    logger.info("flaresolverr_bypass_success", url=url)
+                else:
+                    logger.warning(
+                        "flaresolverr_bypass_failed",
+                        url=url,
+                        message=fs_result.get("message"),
+                    )
+            except Exception as e:
+                logger.error("flaresolverr_error", url=url, error=str(e))
+        else:
+            logger.warning(
+                "cloudflare_no_fallback",
+                url=url,
+                message="FlareSolverr not available for bypass",
+            )
+
+    # Parsed once here and shared by the links, metadata and media extractors
+    parsed = ParsedPage(html_content)
+    result = await _extract_from_html(
+        parsed, url, formats, exclude_tags, status_code, final_url, response_headers
+    )
+
+    # Take screenshot (raw image bytes; base64-encoded only when serialized)
+    if "screenshot" in formats:
+        if screenshot_format == "jpeg":
+            result["screenshot"] = await page.screenshot(
+                full_page=True, type="jpeg", quality=SCREENSHOT_JPEG_QUALITY
+            )
+        else:
+            result["screenshot"] = await page.screenshot(full_page=True, type="png")
+    
+    # Extract media
+    if "media" in formats:
+        import os
+        job_media_dir = os.path.join(settings.media_storage_dir, "scrape")
+        result["media"] = await extract_media(page, url, job_media_dir, parsed)
+    
+    logger.info("scrape_completed", url=url)
+    return result
 
-def extract_links_from_html(html: str, base_url: str) -> List[str]:
+
+def _extract_links_lxml(tree: lxml.html.HtmlElement, base_url: str) -> List[str]:
     """
-    Extract all links from HTML content (used for FlareSolverr responses).
+    Extract all links from a parsed page.
 
     Args:
-        html: HTML content
-        base_url: Base URL for resolving relative links
+        tree: Parsed HTML document
+        base_url: Page URL for resolving relative links (a <base> tag takes precedence)
 
     Returns:
-        List of absolute URLs
+        List of unique absolute URLs in document order
     """
-    soup = BeautifulSoup(html, "lxml")
-    links = []
-    seen = set()
+    base_href = tree.xpath("string(//base/@href)").strip()
+    if base_href:
+        base_url = urljoin(base_url, base_href)
+
+    # Resolve the common href shapes without re-parsing base_url each time
+    base_parts = urlsplit(base_url)
+    base_prefix = f"{base_parts.scheme}://{base_parts.netloc}"
+
+    # dict keeps first-seen order while deduplicating
+    links = {}
 
-    for anchor in soup.find_all("a", href=True):
-        href = anchor.get("href", "")
-        if not href or href.startswith("#") or href.startswith("javascript:"):
+    for href in tree.xpath("//a/@href"):
+        href = href.strip()
+        if not href or href.startswith("#") or href.lower().startswith("javascript:"):
             continue
 
-        absolute_url = urljoin(base_url, href)
-        if absolute_url not in seen:
-            seen.add(absolute_url)
-            links.append(absolute_url)
+        if href.startswith(("http://", "https://")):
+            absolute_url = href
+        elif href.startswith("//"):
+            absolute_url = f"{base_parts.scheme}:{href}"
+        elif href.startswith("/") and "/." not in href:
+            absolute_url = base_prefix + href
+        else:
+            absolute_url = urljoin(base_url, href)
+        links[absolute_url] = None
 
-    return links
+    return list(links)
 
 
-def extract_metadata_from_html(html: str, url: str) -> Dict[str, Any]:
+def _extract_metadata_lxml(tree: lxml.html.HtmlElement, url: str) -> Dict[str, Any]:
     """
-    Extract metadata from HTML content (used for FlareSolverr responses).
+    Extract metadata from a parsed page.
 
     Args:
-        html: HTML content
+        tree: Parsed HTML document
         url: Page URL
 
     Returns:
-        Dictionary with metadata
+        Dictionary with metadata; language is None when the page doesn't declare one
     """
-    soup = BeautifulSoup(html, "lxml")
+    # Collect every <meta> once; the first tag for a name/property wins
+    meta = {}
+    for el in tree.iter("meta"):
+        for attr in ("name", "property"):
+            key = el.get(attr)
+            if key and key not in meta:
+                meta[key] = el.get("content")
+    get_meta = meta.get
 
-    def get_meta(name: str) -> Optional[str]:
-        """Get meta tag content by name or property."""
-        meta = soup.find("meta", attrs={"name": name}) or soup.find(
-            "meta", attrs={"property": name}
-        )
-        return meta.get("content") if meta else None
-
-    title_tag = soup.find("title")
-    html_tag = soup.find("html")
+    title = (tree.findtext(".//title") or "").strip()
 
     return {
-        "title": title_tag.get_text() if title_tag else None,
+        "title": title or None,
         "description": get_meta("description") or get_meta("og:description"),
-        "language": html_tag.get("lang", "en") if html_tag else "en",
+        "language": tree.get("lang") or None,
         "keywords": get_meta("keywords"),
         "author": get_meta("author"),
         "ogTitle": get_meta("og:title"),
@@ -338,13 +609,47 @@ def extract_metadata_from_html(html: str, url: str) -> Dict[str, Any]:
         "twitterDescription": get_meta("twitter:description"),
         "twitterImage": get_meta("twitter:image"),
         "sourceURL": url,
-        "statusCode": 200,
     }
 
 
+def serialize_scrape_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Make a scrape result JSON-safe for storage.
+
+    scrape_url keeps screenshots and document images as raw bytes so internal
+    handoffs avoid the base64 overhead; encode them only where results are
+    persisted.
+
+    Args:
+        data: Result dictionary from scrape_url
+
+    Returns:
+        Result dictionary with the screenshot and images base64-encoded
+    """
+    screenshot = data.get("screenshot")
+    if isinstance(screenshot, (bytes, bytearray)):
+        data = {**data, "screenshot": base64.b64encode(screenshot).decode("ascii")}
+    images = data.get("images")
+    if images and any(isinstance(image.get("data"), (bytes, bytearray)) for image in images):
+        data = {**data, "images": [
+            {**image, "data": base64.b64encode(image["data"]).decode("ascii")}
+            if isinstance(image.get("data"), (bytes, bytearray)) else image
+            for image in images
+        ]}
+    return data
+
+
 def batch_scrape_urls(job_id: str, urls: List[str], config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Scrape multiple URLs in batch (synchronous wrapper for Celery).
+
+    Results are buffered and appended as BatchResult rows every
+    BATCH_FLUSH_SIZE results or BATCH_FLUSH_INTERVAL_SECONDS, whichever
+    comes first, so large batches don't pay a commit per URL. A flush only
+    writes the buffered results, never the ones already stored, so memory
+    and write cost stay proportional to the buffer, not the batch. Writes
+    run in a thread, one at a time, so they don't stall the pages still
+    being scraped.
     
     Args:
         job_id: Job identifier
@@ -352,58 +657,227 @@ def batch_scrape_urls(job_id: str, urls: List[str], config: Dict[str, Any]) -> D
         config: Scrape configuration
     
     Returns:
-        Batch results
+        Batch summary with total, completed and failed counts
     """
     logger.info("batch_scrape_started", job_id=job_id, url_count=len(urls))
-    
-    # Run async scraping
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+
+    db = get_session(settings.database_url)
+    update_batch_status(db, job_id, "running")
+
+    buffer: List[Dict[str, Any]] = []
+    flush_lock = asyncio.Lock()
+    stop_flushing = asyncio.Event()
+
+    def write_results(results: List[Dict[str, Any]]) -> None:
+        try:
+            append_batch_results(db, job_id, results)
+        except Exception:
+            db.rollback()
+            raise
+
+    async def flush() -> None:
+        async with flush_lock:
+            if not buffer:
+                return
+            results = buffer[:]
+            buffer.clear()
+            try:
+                await asyncio.to_thread(write_results, results)
+            except Exception:
+                # Keep the results for the next flush
+                buffer[:0] = results
+                raise
+
+    async def persist_result(result: Dict[str, Any]) -> None:
+        buffer.append(result)
+        if len(buffer) >= BATCH_FLUSH_SIZE:
+            await flush()
+
+    async def flush_periodically() -> None:
+        while True:
+            try:
+                await asyncio.wait_for(stop_flushing.wait(), BATCH_FLUSH_INTERVAL_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await flush()
+            except Exception as e:
+                logger.error("batch_flush_failed", job_id=job_id, error=str(e))
+
+    async def run() -> Dict[str, int]:
+        ticker = asyncio.create_task(flush_periodically())
+        try:
+            return await _batch_scrape_async(urls, config, persist_result)
+        finally:
+            # Let an in-progress write finish rather than cancelling it
+            # while its thread still holds the session
+            stop_flushing.set()
+            await ticker
+            await flush()
     
     try:
-        results = loop.run_until_complete(_batch_scrape_async(urls, config))
-        logger.info("batch_scrape_completed", job_id=job_id)
-        return {"results": results}
+        # Run async scraping on the worker's shared loop
+        summary = run_sync(run())
+        update_batch_status(db, job_id, "completed", completed_at=datetime.utcnow())
+        logger.info("batch_scrape_completed", job_id=job_id, **summary)
+        return summary
+    except Exception as e:
+        update_batch_status(db, job_id, "failed", error=str(e))
+        raise
     finally:
-        loop.close()
+        db.close()
 
 
-async def _batch_scrape_async(urls: List[str], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def _batch_scrape_async(
+    urls: List[str],
+    config: Dict[str, Any],
+    result_sink: Callable[[Dict[str, Any]], Awaitable[None]]
+) -> Dict[str, int]:
     """
     Async implementation of batch scraping.
+
+    At most ``max_concurrent_requests`` URLs are in flight. Each result is
+    handed to ``result_sink`` as soon as it completes and is then dropped,
+    keeping memory proportional to the concurrency limit rather than the
+    number of URLs.
     
     Args:
         urls: List of URLs to scrape
         config: Scrape configuration
+        result_sink: Async callback receiving each URL result
     
     Returns:
-        List of scrape results
+        Batch summary with total, completed and failed counts
     """
     formats = config.get("formats", ["markdown"])
     exclude_tags = config.get("exclude_tags")
+    if exclude_tags is not None:
+        # Build the lookup set once for the whole batch
+        exclude_tags = frozenset(tag.lower() for tag in exclude_tags)
     timeout = config.get("timeout", 30000)
+    wait_until = config.get("wait_until")
+    screenshot_format = config.get("screenshot_format", "png")
     
-    # Scrape URLs concurrently with limit
-    semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
-    
-    async def scrape_with_semaphore(url: str) -> Dict[str, Any]:
-        async with semaphore:
-            try:
-                data = await scrape_url(url, formats, exclude_tags, timeout=timeout)
-                return {"url": url, "success": True, "data": data}
-            except Exception as e:
-                logger.error("batch_scrape_url_failed", url=url, error=str(e))
-                return {"url": url, "success": False, "error": str(e)}
-    
-    tasks = [scrape_with_semaphore(url) for url in urls]
-    results = await asyncio.gather(*tasks)
+    async def scrape_one(url: str, contexts: BatchContexts) -> Dict[str, Any]:
+        try:
+            async with contexts.page_context() as context:
+                data = await scrape_url(
+                    url, formats, exclude_tags, timeout=timeout, wait_until=wait_until,
+                    screenshot_format=screenshot_format, context=context
+                )
+            return {"url": url, "success": True, "data": data}
+        except Exception as e:
+            logger.error("batch_scrape_url_failed", url=url, error=str(e))
+            return {"url": url, "success": False, "error": str(e)}
+
+    pending_urls = iter(urls)
+    in_flight = set()
+    completed = 0
+    failed = 0
+
+    # Pages share the batch's context, which is rotated like pooled contexts
+    async with browser_pool.get_batch_context(extra_headers=config.get("headers")) as contexts:
+
+        # Only max_concurrent_requests tasks exist at any time; the next URL is
+        # started as each one finishes instead of scheduling the whole batch upfront
+        def start_next() -> None:
+            url = next(pending_urls, None)
+            if url is not None:
+                in_flight.add(asyncio.ensure_future(scrape_one(url, contexts)))
+
+        for _ in range(settings.max_concurrent_requests):
+            start_next()
+
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                start_next()
+                result = task.result()
+                if result["success"]:
+                    completed += 1
+                else:
+                    failed += 1
+                await result_sink(result)
+
+    return {"total": len(urls), "completed": completed, "failed": failed}
+
+
+def append_batch_results(db: Session, job_id: str, results: List[Dict[str, Any]]) -> None:
+    """
+    Append URL results to a batch job and update its counters.
+
+    Results are inserted as BatchResult rows in one statement and counters
+    are incremented in SQL, so neither the job row nor earlier results are
+    read back.
+
+    Args:
+        db: Database session
+        job_id: Job identifier
+        results: URL results with url, success and data/error
+    """
+    if not results:
+        return
+
+    rows = []
+    completed = 0
+    failed = 0
+    for result in results:
+        if result["success"]:
+            completed += 1
+        else:
+            failed += 1
+        if result.get("data"):
+            result = {**result, "data": serialize_scrape_result(result["data"])}
+        rows.append({"job_id": job_id, "result": result})
+
+    db.execute(insert(BatchResult), rows)
+    db.execute(
+        update(BatchJob)
+        .where(BatchJob.id == job_id)
+        .values(
+            completed=BatchJob.completed + completed,
+            failed=BatchJob.failed + failed,
+        )
+    )
+    db.commit()
 
-    return results
+
+def update_batch_status(
+    db: Session,
+    job_id: str,
+    status: str,
+    completed_at: Any = None,
+    error: Optional[str] = None
+) -> None:
+    """
+    Update batch job status in database.
+
+    Args:
+        db: Database session
+        job_id: Job identifier
+        status: Job status
+        completed_at: Completion timestamp
+        error: Error message if the job failed
+    """
+    values = {"status": status}
+    if completed_at is not None:
+        values["completed_at"] = completed_at
+    if error is not None:
+        values["error"] = error
+    db.execute(update(BatchJob).where(BatchJob.id == job_id).values(**values))
+    db.commit()
 
 
 async def _check_content_type(url: str, timeout: int = 30000) -> tuple:
     """
-    Check URL content-type via HEAD request to detect documents.
+    Detect documents from the response headers and first bytes of a URL.
+
+    Uses a ranged GET rather than HEAD: many servers and CDNs reject HEAD or
+    omit/mislabel Content-Type, and the first KB allows sniffing PDF and
+    DOCX magic bytes. Only that first KB is read even if the server ignores
+    the Range header. Results are cached per URL, so repeated URLs in
+    batches and crawls skip the request.
 
     Args:
         url: URL to check
@@ -412,13 +886,57 @@ async def _check_content_type(url: str, timeout: int = 30000) -> tuple:
     Returns:
         Tuple of (is_document, document_type)
     """
+    parts = urlsplit(url)
+    cache_key = (parts.scheme, parts.netloc.lower(), parts.path, parts.query)
+    cached = _content_type_cache.get(cache_key)
+    if cached is not None:
+        _content_type_cache.move_to_end(cache_key)
+        return cached
+
     try:
-        timeout_seconds = timeout / 1000
-        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-            response = await client.head(url, follow_redirects=True)
+        async with get_http_client().stream(
+            "GET",
+            url,
+            headers={"Range": f"bytes=0-{CONTENT_SNIFF_BYTES - 1}"},
+            follow_redirects=True,
+            timeout=timeout / 1000,
+        ) as response:
             content_type = response.headers.get('content-type', '')
-            return is_document_url(url, content_type)
+            head = b""
+            async for chunk in response.aiter_bytes():
+                head += chunk
+                if len(head) >= CONTENT_SNIFF_BYTES:
+                    break
+        result = is_document_url(url, content_type)
+        if not result[0]:
+            result = _sniff_document_type(head)
     except Exception as e:
-        # If HEAD request fails, just return False and let scraper try normally
+        # If the check fails, just return False and let scraper try normally
         logger.debug("content_type_check_failed", url=url, error=str(e))
         return False, None
+
+    _content_type_cache[cache_key] = result
+    if len(_content_type_cache) > CONTENT_TYPE_CACHE_SIZE:
+        _content_type_cache.popitem(last=False)
+    return result
+
+
+def _sniff_document_type(head: bytes) -> tuple:
+    """
+    Identify a document from its leading bytes.
+
+    Args:
+        head: First bytes of the response body
+
+    Returns:
+        Tuple of (is_document, document_type)
+    """
+    if head.startswith(b"%PDF-"):
+        return True, "pdf"
+    # DOCX is an Office Open XML ZIP archive; its first entries are
+    # [Content_Types].xml and the word/ part
+    if head.startswith(b"PK\x03\x04") and (
+        b"word/" in head or b"[Content_Types].xml" in head
+    ):
+        return True, "docx"
+    return False, None
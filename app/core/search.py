@@ -5,6 +5,8 @@ Web search functionality using DuckDuckGo.
 import asyncio
 from typing import List, Dict, Any, Optional
 
+from app.config import settings
+from app.core.loop import run_sync
 from app.core.scraper import scrape_url
 from app.utils.logger import get_logger
 
@@ -98,41 +100,42 @@ async def search_and_scrape(
     # Get search results
     search_results = search_web(query, max_results, region)
 
-    # Scrape each result
-    scraped_results = []
-
-    for result in search_results:
-        url = result.get("url", "")
-        if not url:
-            continue
-
-        try:
-            # Scrape the URL
-            data = await scrape_url(
-                url=url,
-                formats=formats,
-                timeout=timeout
-            )
-
-            scraped_results.append({
-                "url": url,
-                "title": result.get("title"),
-                "snippet": result.get("snippet"),
-                "success": True,
-                "data": data
-            })
-
-            logger.debug("search_result_scraped", url=url)
-
-        except Exception as e:
-            logger.warning("search_result_scrape_failed", url=url, error=str(e))
-            scraped_results.append({
-                "url": url,
-                "title": result.get("title"),
-                "snippet": result.get("snippet"),
-                "success": False,
-                "error": str(e)
-            })
+    # Scrape results concurrently; gather keeps the search ranking order
+    semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+
+    async def scrape_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        url = result["url"]
+        async with semaphore:
+            try:
+                # Scrape the URL
+                data = await scrape_url(
+                    url=url,
+                    formats=formats,
+                    timeout=timeout
+                )
+
+                logger.debug("search_result_scraped", url=url)
+                return {
+                    "url": url,
+                    "title": result.get("title"),
+                    "snippet": result.get("snippet"),
+                    "success": True,
+                    "data": data
+                }
+
+            except Exception as e:
+                logger.warning("search_result_scrape_failed", url=url, error=str(e))
+                return {
+                    "url": url,
+                    "title": result.get("title"),
+                    "snippet": result.get("snippet"),
+                    "success": False,
+                    "error": str(e)
+                }
+
+    scraped_results = list(await asyncio.gather(
+        *(scrape_result(result) for result in search_results if result.get("url"))
+    ))
 
     logger.info("search_and_scrape_completed", query=query, scraped_count=len(scraped_results))
 
@@ -163,12 +166,4 @@ def search_and_scrape_sync(
     Returns:
         Dictionary with query, results, and scraped content
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        return loop.run_until_complete(
-            search_and_scrape(query, max_results, formats, region, timeout)
-        )
-    finally:
-        loop.close()
+    return run_sync(search_and_scrape(query, max_results, formats, region, timeout))
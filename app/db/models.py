@@ -2,13 +2,21 @@
 SQLAlchemy database models for SimpleCrawl.
 """
 
+import zlib
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Generator
+from typing import Any, Optional, Generator
 
-from sqlalchemy import String, Integer, Text, DateTime, Boolean, JSON, create_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy import (
+    String, Integer, Text, DateTime, Boolean, JSON, LargeBinary, Index, ForeignKey,
+    create_engine, event, text
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session, sessionmaker
 from sqlalchemy.pool import QueuePool
+from sqlalchemy.types import TypeDecorator
+
+from app.utils import serialization
 
 
 class Base(DeclarativeBase):
@@ -19,6 +27,53 @@ class Base(DeclarativeBase):
 # Global engine cache for connection pooling
 _engine_cache: dict = {}
 
+# Session factories per database URL, built alongside the engine
+_sessionmaker_cache: dict[str, sessionmaker] = {}
+
+# zlib level for job payloads stored on SQLite; low levels already shrink
+# scraped HTML/markdown several times over at a fraction of the CPU
+JSON_COMPRESSION_LEVEL = 1
+
+
+class _RawBytes(LargeBinary):
+    """LargeBinary that hands values back untouched, so legacy TEXT rows stay str."""
+
+    def result_processor(self, dialect, coltype):
+        return None
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON column for large job payloads.
+
+    Stored as JSONB on PostgreSQL and as zlib-compressed JSON on SQLite, so
+    rewriting a job's results doesn't rewrite megabytes of raw text. Other
+    databases use the plain JSON type.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(_RawBytes())
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        if value is None or dialect.name != "sqlite":
+            return value
+        return zlib.compress(serialization.dumps(value), JSON_COMPRESSION_LEVEL)
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None or dialect.name != "sqlite":
+            return value
+        if isinstance(value, str):
+            # Rows written before compression was introduced are plain JSON text
+            return serialization.loads(value)
+        return serialization.loads(zlib.decompress(value))
+
 
 class CrawlJob(Base):
     """Model for crawl jobs."""
@@ -31,8 +86,8 @@ class CrawlJob(Base):
     total: Mapped[int] = mapped_column(Integer, default=0)
     completed: Mapped[int] = mapped_column(Integer, default=0)
     failed: Mapped[int] = mapped_column(Integer, default=0)
-    config: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
-    results: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    config: Mapped[Optional[dict]] = mapped_column(CompressedJSON, nullable=True)
+    results: Mapped[Optional[dict]] = mapped_column(CompressedJSON, nullable=True)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -48,17 +103,46 @@ class BatchJob(Base):
     total: Mapped[int] = mapped_column(Integer, default=0)
     completed: Mapped[int] = mapped_column(Integer, default=0)
     failed: Mapped[int] = mapped_column(Integer, default=0)
-    config: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
-    results: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    config: Mapped[Optional[dict]] = mapped_column(CompressedJSON, nullable=True)
+    # Only set on jobs written before results moved to BatchResult rows
+    results: Mapped[Optional[dict]] = mapped_column(CompressedJSON, nullable=True)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
 
+class BatchResult(Base):
+    """
+    One URL result of a batch job.
+
+    Results are inserted as they complete, so saving more of them never
+    reads back or rewrites the ones already stored.
+    """
+    
+    __tablename__ = "batch_results"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(
+        String(50), ForeignKey("batch_jobs.id"), nullable=False, index=True
+    )
+    result: Mapped[dict] = mapped_column(CompressedJSON, nullable=False)
+
+
 class Monitor(Base):
     """Model for content change monitoring."""
     
     __tablename__ = "monitors"
+    __table_args__ = (
+        # Scheduler lookup: active AND next_check <= now. Partial where
+        # supported so inactive monitors aren't in the index at all.
+        Index(
+            "ix_monitor_due",
+            "active",
+            "next_check",
+            postgresql_where=text("active"),
+            sqlite_where=text("active"),
+        ),
+    )
     
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
@@ -71,11 +155,28 @@ class Monitor(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Tune each new SQLite connection for concurrent job writes.
+
+    WAL lets readers (status endpoints) run alongside the worker's writes,
+    and synchronous=NORMAL drops the per-commit fsync that WAL makes safe.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 def get_engine(database_url: str):
     """
     Get or create a database engine with connection pooling.
 
-    Uses a global cache to ensure only one engine is created per database URL.
+    Uses a global cache to ensure only one engine is created per database URL,
+    and builds the matching session factory at the same time.
 
     Args:
         database_url: SQLAlchemy database URL
@@ -90,8 +191,11 @@ def get_engine(database_url: str):
             _engine_cache[database_url] = create_engine(
                 database_url,
                 echo=False,
-                connect_args={"check_same_thread": False}
+                connect_args={"check_same_thread": False},
+                json_serializer=serialization.dumps_str,
+                json_deserializer=serialization.loads,
             )
+            event.listen(_engine_cache[database_url], "connect", _set_sqlite_pragmas)
         else:
             _engine_cache[database_url] = create_engine(
                 database_url,
@@ -100,8 +204,14 @@ def get_engine(database_url: str):
                 pool_size=5,
                 max_overflow=10,
                 pool_pre_ping=True,
-                pool_recycle=3600
+                pool_recycle=3600,
+                json_serializer=serialization.dumps_str,
+                json_deserializer=serialization.loads,
             )
+        # expire_on_commit=False: objects stay usable after commit without a re-SELECT
+        _sessionmaker_cache[database_url] = sessionmaker(
+            _engine_cache[database_url], class_=Session, expire_on_commit=False
+        )
     return _engine_cache[database_url]
 
 
@@ -115,12 +225,16 @@ def init_db(database_url: str) -> None:
     engine = get_engine(database_url)
     Base.metadata.create_all(engine)
 
+    # create_all skips indexes on tables that already exist
+    for index in Monitor.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
 
 def get_session(database_url: str) -> Session:
     """
     Get a database session.
 
-    Uses the cached engine for connection pooling.
+    Uses the cached engine and session factory for connection pooling.
 
     Args:
         database_url: SQLAlchemy database URL
@@ -128,8 +242,9 @@ def get_session(database_url: str) -> Session:
     Returns:
         Database session
     """
-    engine = get_engine(database_url)
-    return Session(engine)
+    if database_url not in _sessionmaker_cache:
+        get_engine(database_url)
+    return _sessionmaker_cache[database_url]()
 
 
 @contextmanager
@@ -4,23 +4,35 @@ SimpleCrawl - Self-hosted web scraping and data extraction API.
 Main FastAPI application entry point.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from typing import Dict
+
+import anyio.to_thread
+from fastapi import FastAPI, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.routing import Route
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
 from app.utils.logger import configure_logging, get_logger
 from app.db.models import init_db
 from app.core.browser import browser_pool
+from app.utils.http_client import close_http_client
+from app.utils.markdown import shutdown_markdown_pool
+from app.utils import serialization
+from app.utils.cors import StaticCORSMiddleware
+from app.utils.documents import shutdown_pdf_pool
+from app.utils.errors import rate_limit_exceeded_handler, validation_exception_handler
+from app.utils.flat_router import FlatAPIRouter
+from app.utils.rate_limit import ClientIPMiddleware, limiter
 from app.api.routes import health, scrape, map, crawl, extract, batch, monitor, search, analyze
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# orjson-backed responses when orjson is installed
+DEFAULT_RESPONSE_CLASS = ORJSONResponse if serialization.ORJSON_AVAILABLE else JSONResponse
 
 # Configure logging
 configure_logging(settings.log_level)
@@ -35,23 +47,40 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("application_starting", version="1.0.0")
     
-    # Initialize database
-    try:
-        init_db(settings.database_url)
+    # One sized thread pool for asyncio.to_thread/run_in_executor, and the
+    # same limit for Starlette's run_in_threadpool (sync endpoints, file I/O)
+    executor = ThreadPoolExecutor(
+        max_workers=settings.threadpool_size, thread_name_prefix="simplecrawl-sync"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    
+    # Initialize database and browser pool concurrently; they are
+    # independent and the browser launch dominates startup time
+    db_result, browser_result = await asyncio.gather(
+        asyncio.to_thread(init_db, settings.database_url),
+        browser_pool.initialize(),
+        return_exceptions=True
+    )
+    
+    if isinstance(db_result, BaseException):
+        logger.error("database_initialization_failed", error=str(db_result))
+    else:
         # Don't log the full database URL as it may contain credentials
         db_type = settings.database_url.split(":")[0] if ":" in settings.database_url else "unknown"
         logger.info("database_initialized", type=db_type)
-    except Exception as e:
-        logger.error("database_initialization_failed", error=str(e))
-        raise
     
-    # Initialize browser pool
-    try:
-        await browser_pool.initialize()
+    if isinstance(browser_result, BaseException):
+        logger.error("browser_pool_initialization_failed", error=str(browser_result))
+    else:
         logger.info("browser_pool_initialized")
-    except Exception as e:
-        logger.error("browser_pool_initialization_failed", error=str(e))
-        raise
+    
+    if isinstance(db_result, BaseException):
+        if not isinstance(browser_result, BaseException):
+            await browser_pool.close()
+        raise db_result
+    if isinstance(browser_result, BaseException):
+        raise browser_result
     
     logger.info("application_started")
     
@@ -66,6 +95,11 @@ async def lifespan(app: FastAPI):
         logger.info("browser_pool_closed")
     except Exception as e:
         logger.error("browser_pool_close_failed", error=str(e))
+
+    await close_http_client()
+    shutdown_markdown_pool()
+    shutdown_pdf_pool()
+    executor.shutdown(wait=False)
     
     logger.info("application_shutdown_complete")
 
@@ -77,54 +111,105 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=DEFAULT_RESPONSE_CLASS,
     lifespan=lifespan
 )
 
-# Add rate limiter to app state and register exception handler
+# Add rate limiter to app state and register exception handlers
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# Add CORS middleware
-# Note: allow_credentials=False when using allow_origins=["*"] for security
-# In production, specify explicit origins and set allow_credentials=True if needed
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(health.router, tags=["Health"])
-app.include_router(scrape.router, prefix="/v1", tags=["Scraping"])
-app.include_router(map.router, prefix="/v1", tags=["Mapping"])
-app.include_router(crawl.router, prefix="/v1", tags=["Crawling"])
-app.include_router(extract.router, prefix="/v1", tags=["Extraction"])
-app.include_router(batch.router, prefix="/v1", tags=["Batch"])
-app.include_router(monitor.router, prefix="/v1", tags=["Monitoring"])
-app.include_router(search.router, prefix="/v1", tags=["Search"])
-app.include_router(analyze.router, prefix="/v1", tags=["Analysis"])
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+app.add_exception_handler(RequestValidationError, validation_exception_handler)
+
+# Add CORS middleware: any origin, method and header, without credentials.
+# Pure ASGI with precomputed headers; to restrict origins or allow
+# credentials, swap back to fastapi.middleware.cors.CORSMiddleware.
+app.add_middleware(StaticCORSMiddleware)
+
+# Compress large markdown/HTML payloads. Responses that set their own
+# Content-Encoding (scrapes carrying screenshots) are passed through as is.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Resolve the client IP once per request for the rate limiter key
+app.add_middleware(ClientIPMiddleware)
+
+# Include routers (flat: route objects are moved over rather than rebuilt)
+api_router = FlatAPIRouter(default_response_class=DEFAULT_RESPONSE_CLASS)
+api_router.include_router(health.router, tags=["Health"])
+api_router.include_router(scrape.router, prefix="/v1", tags=["Scraping"])
+api_router.include_router(map.router, prefix="/v1", tags=["Mapping"])
+api_router.include_router(crawl.router, prefix="/v1", tags=["Crawling"])
+api_router.include_router(extract.router, prefix="/v1", tags=["Extraction"])
+api_router.include_router(batch.router, prefix="/v1", tags=["Batch"])
+api_router.include_router(monitor.router, prefix="/v1", tags=["Monitoring"])
+api_router.include_router(search.router, prefix="/v1", tags=["Search"])
+api_router.include_router(analyze.router, prefix="/v1", tags=["Analysis"])
+app.router.routes.extend(api_router.routes)
 
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": "SimpleCrawl API",
-        "version": "1.0.0",
-        "description": "Self-hosted web scraping and data extraction API",
-        "docs": "/docs",
-        "health": "/v1/health"
-    }
+    return Response(content=health.ROOT_INFO_BODY, media_type="application/json")
+
+
+# OpenAPI schema: the routes are static once registered, so build the schema
+# and its JSON encoding once at import instead of on the first /docs hit
+# (app.openapi() then returns the cached dict for any other caller). Behind a
+# prefix proxy (--root-path) the body gets a matching servers entry, encoded
+# once per root path as FastAPI's own route would add it.
+_openapi_bodies: Dict[str, bytes] = {"": serialization.dumps(app.openapi())}
+
+
+def _encode_openapi(root_path: str) -> bytes:
+    """
+    Encode the OpenAPI schema for a root path.
+
+    Args:
+        root_path: ASGI root_path without a trailing slash
+
+    Returns:
+        JSON-encoded schema
+    """
+    schema = app.openapi()
+    servers = schema.get("servers", [])
+    if app.root_path_in_servers and all(server.get("url") != root_path for server in servers):
+        schema = {**schema, "servers": [{"url": root_path}, *servers]}
+    return serialization.dumps(schema)
+
+
+async def openapi_json(request: Request) -> Response:
+    """Serve the pre-encoded OpenAPI schema."""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    body = _openapi_bodies.get(root_path)
+    if body is None:
+        body = _openapi_bodies[root_path] = _encode_openapi(root_path)
+    return Response(content=body, media_type="application/json")
+
+
+# Swap FastAPI's built-in /openapi.json route (which re-encodes the schema on
+# every request) for the pre-encoded one, keeping /docs and /redoc pointed at it
+app.router.routes = [
+    Route(app.openapi_url, openapi_json, include_in_schema=False)
+    if isinstance(route, Route) and route.path == app.openapi_url else route
+    for route in app.router.routes
+]
 
 
 if __name__ == "__main__":
     import uvicorn
+    # uvloop/httptools (from uvicorn[standard]) are requested explicitly
+    # rather than via "auto", so a missing extra fails loudly instead of
+    # silently falling back to the pure-Python loop and parser. The reloader
+    # runs the app behind a supervisor process, so only enable it in development;
+    # otherwise run WORKERS processes (each with its own browser pool).
+    development = settings.env == "development"
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=True,
+        reload=development,
+        workers=None if development else settings.workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower()
     )
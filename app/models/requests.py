@@ -2,8 +2,9 @@
 Pydantic request models for API endpoints.
 """
 
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+import hashlib
+from typing import Annotated, Literal, Optional, List, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints, computed_field, field_validator
 
 # Maximum limits for input validation
 MAX_CRAWL_DEPTH = 50
@@ -11,17 +12,84 @@ MAX_CRAWL_PAGES = 5000
 MAX_BATCH_URLS = 100
 MAX_EXTRACT_URLS = 50
 MAX_TIMEOUT_MS = 120000
+MAX_URL_LENGTH = 2048
+
+# Accepted option values, checked by the compiled schema rather than Python validators.
+# "text" and "images" only apply to document (PDF/DOCX) URLs.
+ScrapeFormat = Literal["markdown", "html", "screenshot", "links", "metadata", "media", "text", "images"]
+ScreenshotFormat = Literal["png", "jpeg"]
+WaitUntil = Literal["domcontentloaded", "load", "networkidle", "commit"]
+
+# Cheap shape check for http(s) URLs. Full parsing (and SSRF checks) happens
+# once in the scraper/crawler via validate_url, not on every request model.
+UrlStr = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True,
+        max_length=MAX_URL_LENGTH,
+        pattern=r"^(?i:https?)://[^\s/?#]+(?:[/?#]\S*)?$",
+    ),
+]
+
+
+def _dedupe_urls(v: List[str]) -> List[str]:
+    """Drop repeated URLs (keeping first-seen order) once they are stripped and validated."""
+    return list(dict.fromkeys(v))
+
+
+def _request_key(*parts: str) -> str:
+    """Short stable digest identifying a request's inputs."""
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class PageAction(BaseModel):
+    """A page action run before scraping (see app.core.actions for semantics)."""
+
+    type: Literal["wait", "click", "scroll", "type", "write", "press", "screenshot"] = Field(
+        ..., description="Action type"
+    )
+    selector: Optional[str] = Field(default=None, description="CSS selector the action targets")
+    milliseconds: Optional[int] = Field(default=None, ge=0, description="wait: time to wait in ms")
+    state: Optional[Literal["visible", "hidden", "attached", "detached"]] = Field(
+        default=None, description="wait: element state to wait for"
+    )
+    timeout: Optional[int] = Field(default=None, ge=0, description="wait: selector timeout in ms")
+    button: Optional[Literal["left", "right", "middle"]] = Field(default=None, description="click: mouse button")
+    click_count: Optional[int] = Field(default=None, ge=1, description="click: number of clicks")
+    delay: Optional[int] = Field(default=None, ge=0, description="click/type: delay in ms")
+    direction: Optional[Literal["up", "down", "left", "right"]] = Field(
+        default=None, description="scroll: direction"
+    )
+    amount: Optional[int] = Field(default=None, description="scroll: pixels to scroll")
+    text: Optional[str] = Field(default=None, description="type/write: text to type")
+    clear: Optional[bool] = Field(default=None, description="type/write: clear existing text first")
+    key: Optional[str] = Field(default=None, description="press: key to press")
+    path: Optional[str] = Field(default=None, description="screenshot: filename in the screenshot directory")
+    full_page: Optional[bool] = Field(default=None, description="screenshot: capture the full page")
+
+
+class ScrapeOptions(BaseModel):
+    """Per-page scrape options for crawls."""
+
+    formats: List[ScrapeFormat] = Field(
+        default=["markdown", "metadata"],
+        description="Output formats for each crawled page"
+    )
+    exclude_tags: Optional[List[str]] = Field(
+        default=None,
+        description="HTML tags to exclude from markdown conversion"
+    )
 
 
 class ScrapeRequest(BaseModel):
     """Request model for scraping a single URL."""
 
-    url: HttpUrl = Field(..., description="URL to scrape")
-    formats: List[str] = Field(
+    url: UrlStr = Field(..., description="URL to scrape")
+    formats: List[ScrapeFormat] = Field(
         default=["markdown"],
         description="Output formats: markdown, html, screenshot, links, metadata, media"
     )
-    actions: Optional[List[Dict[str, Any]]] = Field(
+    actions: Optional[List[PageAction]] = Field(
         default=None,
         description="Page actions to perform before scraping"
     )
@@ -33,9 +101,12 @@ class ScrapeRequest(BaseModel):
         default=None,
         description="CSS selector to wait for before scraping"
     )
-    wait_until: str = Field(
-        default="domcontentloaded",
-        description="Page load strategy: domcontentloaded (fast), load, or networkidle (slow but complete)"
+    wait_until: Optional[WaitUntil] = Field(
+        default=None,
+        description=(
+            "Page load strategy: domcontentloaded (fast), load, or networkidle (slow but complete). "
+            "Defaults to networkidle for screenshot/media formats, domcontentloaded otherwise"
+        )
     )
     timeout: int = Field(
         default=30000,
@@ -47,20 +118,16 @@ class ScrapeRequest(BaseModel):
         default=None,
         description="Custom HTTP headers (e.g., Authorization, Cookie) for authenticated requests"
     )
-
-    @field_validator("wait_until")
-    @classmethod
-    def validate_wait_until(cls, v: str) -> str:
-        allowed = ["domcontentloaded", "load", "networkidle", "commit"]
-        if v not in allowed:
-            raise ValueError(f"wait_until must be one of: {', '.join(allowed)}")
-        return v
+    screenshot_format: ScreenshotFormat = Field(
+        default="png",
+        description="Screenshot image format: png (lossless) or jpeg (faster, much smaller)"
+    )
 
 
 class MapRequest(BaseModel):
     """Request model for mapping a website."""
     
-    url: HttpUrl = Field(..., description="Base URL to map")
+    url: UrlStr = Field(..., description="Base URL to map")
     search: Optional[str] = Field(
         default=None,
         description="Search term to filter URLs"
@@ -70,7 +137,7 @@ class MapRequest(BaseModel):
 class CrawlRequest(BaseModel):
     """Request model for crawling a website."""
 
-    url: HttpUrl = Field(..., description="Starting URL to crawl")
+    url: UrlStr = Field(..., description="Starting URL to crawl")
     limit: int = Field(
         default=100,
         ge=1,
@@ -83,7 +150,7 @@ class CrawlRequest(BaseModel):
         le=MAX_CRAWL_DEPTH,
         description=f"Maximum crawl depth (1-{MAX_CRAWL_DEPTH})"
     )
-    scrape_options: Optional[Dict[str, Any]] = Field(
+    scrape_options: Optional[ScrapeOptions] = Field(
         default=None,
         description="Options for scraping each page"
     )
@@ -104,7 +171,7 @@ class CrawlRequest(BaseModel):
 class ExtractRequest(BaseModel):
     """Request model for AI-powered extraction."""
 
-    urls: List[HttpUrl] = Field(
+    urls: List[UrlStr] = Field(
         ...,
         min_length=1,
         max_length=MAX_EXTRACT_URLS,
@@ -119,27 +186,47 @@ class ExtractRequest(BaseModel):
         description="Natural language extraction prompt"
     )
 
+    @field_validator("urls")
+    @classmethod
+    def dedupe_urls(cls, v: List[str]) -> List[str]:
+        return _dedupe_urls(v)
+
 
 class BatchScrapeRequest(BaseModel):
     """Request model for batch scraping."""
 
-    urls: List[HttpUrl] = Field(
+    urls: List[UrlStr] = Field(
         ...,
         min_length=1,
         max_length=MAX_BATCH_URLS,
         description=f"List of URLs to scrape (1-{MAX_BATCH_URLS})"
     )
-    formats: List[str] = Field(
+    formats: List[ScrapeFormat] = Field(
         default=["markdown"],
         description="Output formats for each URL"
     )
+    screenshot_format: ScreenshotFormat = Field(
+        default="png",
+        description="Screenshot image format: png (lossless) or jpeg (faster, much smaller)"
+    )
+
+    @field_validator("urls")
+    @classmethod
+    def dedupe_urls(cls, v: List[str]) -> List[str]:
+        return _dedupe_urls(v)
+
+    @computed_field
+    @property
+    def cache_key(self) -> str:
+        """Digest of the URLs and output options, identical for identical requests."""
+        return _request_key(",".join(self.urls), ",".join(self.formats), self.screenshot_format)
 
 
 class MonitorRequest(BaseModel):
     """Request model for content monitoring."""
     
-    url: HttpUrl = Field(..., description="URL to monitor")
-    webhook_url: Optional[HttpUrl] = Field(
+    url: UrlStr = Field(..., description="URL to monitor")
+    webhook_url: Optional[UrlStr] = Field(
         default=None,
         description="Webhook URL for change notifications"
     )
@@ -2,9 +2,24 @@
 Pydantic response models for API endpoints.
 """
 
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from pydantic import BaseModel, Field
+import base64
+from typing import Annotated, Optional, List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, Field, PlainSerializer, field_validator
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def _to_epoch_ms(value: datetime) -> int:
+    """Convert a datetime to Unix epoch milliseconds (naive values are UTC, as stored in the DB)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _ONE_MS
+
+
+# Datetime that serializes as an integer Unix timestamp in milliseconds
+EpochMillis = Annotated[datetime, PlainSerializer(_to_epoch_ms, return_type=int)]
 
 
 class MediaItem(BaseModel):
@@ -27,6 +42,14 @@ class DocumentImage(BaseModel):
     height: Optional[int] = Field(None, description="Image height in pixels")
     content_type: Optional[str] = Field(None, description="MIME content type")
 
+    @field_validator("data", mode="before")
+    @classmethod
+    def encode_data(cls, v: Any) -> Any:
+        # Document parsers return raw image bytes; encode only at the API boundary
+        if isinstance(v, (bytes, bytearray)):
+            return base64.b64encode(v).decode("ascii")
+        return v
+
 
 class ScrapeData(BaseModel):
     """Model for scraped page data or parsed document."""
@@ -45,6 +68,14 @@ class ScrapeData(BaseModel):
     document_type: Optional[str] = Field(None, description="Document type if URL was a document: pdf, docx")
     images: Optional[List[DocumentImage]] = Field(None, description="Images extracted from document")
 
+    @field_validator("screenshot", mode="before")
+    @classmethod
+    def encode_screenshot(cls, v: Any) -> Any:
+        # The scraper returns raw image bytes; encode only at the API boundary
+        if isinstance(v, (bytes, bytearray)):
+            return base64.b64encode(v).decode()
+        return v
+
 
 class ScrapeResponse(BaseModel):
     """Response model for scrape endpoint."""
@@ -87,8 +118,8 @@ class JobStatusResponse(BaseModel):
     completed: int = Field(..., description="Number of completed items")
     failed: int = Field(..., description="Number of failed items")
     data: Optional[List[Dict[str, Any]]] = Field(None, description="Job results")
-    created_at: Optional[datetime] = Field(None, description="Job creation time")
-    completed_at: Optional[datetime] = Field(None, description="Job completion time")
+    created_at: Optional[EpochMillis] = Field(None, description="Job creation time (Unix epoch ms)")
+    completed_at: Optional[EpochMillis] = Field(None, description="Job completion time (Unix epoch ms)")
     error: Optional[str] = Field(None, description="Error message if failed")
 
 
@@ -105,7 +136,7 @@ class MonitorResponse(BaseModel):
     
     success: bool = Field(..., description="Whether the request succeeded")
     monitor_id: Optional[str] = None
-    next_check: Optional[datetime] = None
+    next_check: Optional[EpochMillis] = Field(None, description="Next check time (Unix epoch ms)")
     error: Optional[Dict[str, Any]] = None
 
 
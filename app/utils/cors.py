@@ -0,0 +1,59 @@
+"""
+Minimal CORS middleware for the API's allow-everything policy.
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Preflight results may be cached by browsers for this long
+CORS_MAX_AGE_SECONDS = 600
+
+_ALLOW_ORIGIN = (b"access-control-allow-origin", b"*")
+_PREFLIGHT_HEADERS = [
+    _ALLOW_ORIGIN,
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", str(CORS_MAX_AGE_SECONDS).encode()),
+    (b"content-length", b"0"),
+]
+
+
+class StaticCORSMiddleware:
+    """
+    Pure ASGI CORS middleware with precomputed headers.
+
+    Equivalent to CORSMiddleware(allow_origins=["*"], allow_methods=["*"],
+    allow_headers=["*"], allow_credentials=False): every response gets
+    "Access-Control-Allow-Origin: *" and preflight requests are answered
+    directly, echoing the requested headers (a literal "*" wouldn't cover
+    Authorization).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            requested_headers = None
+            is_preflight = False
+            for name, value in scope["headers"]:
+                if name == b"access-control-request-method":
+                    is_preflight = True
+                elif name == b"access-control-request-headers":
+                    requested_headers = value
+            if is_preflight:
+                headers = _PREFLIGHT_HEADERS
+                if requested_headers:
+                    headers = [*headers, (b"access-control-allow-headers", requested_headers)]
+                await send({"type": "http.response.start", "status": 204, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), _ALLOW_ORIGIN]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
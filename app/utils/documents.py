@@ -4,15 +4,18 @@ Document parsing utilities for PDF and DOCX files.
 Provides extraction of text, metadata, and images from documents.
 """
 
+import asyncio
 import io
-import os
-import base64
+import multiprocessing
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 
-import httpx
-
+from app.config import settings
+from app.utils.http_client import get_http_client
 from app.utils.logger import get_logger
 from app.utils.url_validator import validate_url
 
@@ -24,6 +27,8 @@ DOCUMENT_EXTENSIONS = {
     '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     '.doc': 'application/msword',
 }
+DOCUMENT_SUFFIXES = tuple(DOCUMENT_EXTENSIONS)
+DOCUMENT_EXTENSION_TYPES = {'.pdf': 'pdf', '.docx': 'docx', '.doc': 'doc'}
 
 # Content types we can handle
 DOCUMENT_CONTENT_TYPES = {
@@ -32,16 +37,34 @@ DOCUMENT_CONTENT_TYPES = {
     'application/msword': 'doc',
 }
 
+# Documents are downloaded in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 100 * 1024
+
+# PDFs with at least this many pages have their text extracted in parallel
+PDF_PARALLEL_MIN_PAGES = 8
+
+# Worker processes for PDF text extraction, created on first use
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+_pdf_pool_workers = max(1, settings.pdf_pool_workers)
+
+# Parser modules, imported on first use (pymupdf is slow to import)
+_fitz = None
+_docx_document = None
+
 
 class DocumentParseError(Exception):
     """Raised when document parsing fails."""
     pass
 
 
+@lru_cache(maxsize=8192)
 def is_document_url(url: str, content_type: Optional[str] = None) -> Tuple[bool, Optional[str]]:
     """
     Check if a URL points to a document we can parse.
 
+    Memoized, since crawls and batches check the same URLs repeatedly.
+
     Args:
         url: URL to check
         content_type: Optional content-type header from response
@@ -59,10 +82,9 @@ def is_document_url(url: str, content_type: Optional[str] = None) -> Tuple[bool,
     parsed = urlparse(url)
     path = parsed.path.lower()
 
-    for ext, _ in DOCUMENT_EXTENSIONS.items():
-        if path.endswith(ext):
-            doc_type = 'pdf' if ext == '.pdf' else 'docx' if ext == '.docx' else 'doc'
-            return True, doc_type
+    if path.endswith(DOCUMENT_SUFFIXES):
+        # Every suffix starts at the path's last dot
+        return True, DOCUMENT_EXTENSION_TYPES[path[path.rfind('.'):]]
 
     return False, None
 
@@ -71,6 +93,11 @@ async def download_document(url: str, timeout: int = 30000) -> Tuple[bytes, str]
     """
     Download a document from URL.
 
+    The body is streamed in chunks that are joined once into the returned
+    bytes (the type pymupdf and BytesIO use without copying), and downloads
+    over max_document_size_mb are rejected as soon as the Content-Length
+    header or the received bytes exceed it.
+
     Args:
         url: Document URL
         timeout: Timeout in milliseconds
@@ -85,12 +112,149 @@ async def download_document(url: str, timeout: int = 30000) -> Tuple[bytes, str]
 
     timeout_seconds = timeout / 1000
 
-    async with httpx.AsyncClient(timeout=timeout_seconds, follow_redirects=True) as client:
-        response = await client.get(url)
+    max_size = settings.max_document_size_bytes
+
+    async with get_http_client().stream(
+        "GET", url, timeout=timeout_seconds, follow_redirects=True
+    ) as response:
         response.raise_for_status()
 
+        content_length = response.headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) > max_size:
+            raise DocumentParseError(f"Document too large: {content_length} bytes")
+
+        chunks = []
+        received = 0
+        async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received > max_size:
+                raise DocumentParseError(f"Document too large: over {max_size} bytes")
+
         content_type = response.headers.get('content-type', '')
-        return response.content, content_type
+        return b"".join(chunks), content_type
+
+
+def _get_fitz() -> Any:
+    """
+    Import pymupdf once per process.
+
+    Returns:
+        The fitz module
+
+    Raises:
+        DocumentParseError: If pymupdf is not installed
+    """
+    global _fitz
+    if _fitz is None:
+        try:
+            import fitz  # pymupdf
+        except ImportError:
+            raise DocumentParseError("pymupdf not installed. Install with: pip install pymupdf")
+        _fitz = fitz
+    return _fitz
+
+
+def _get_docx_document() -> Any:
+    """
+    Import python-docx once per process.
+
+    Returns:
+        The docx.Document constructor
+
+    Raises:
+        DocumentParseError: If python-docx is not installed
+    """
+    global _docx_document
+    if _docx_document is None:
+        try:
+            from docx import Document
+        except ImportError:
+            raise DocumentParseError("python-docx not installed. Install with: pip install python-docx")
+        _docx_document = Document
+    return _docx_document
+
+
+def _get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the process pool used for PDF text extraction, creating it on first use.
+
+    Workers are spawned rather than forked, like the markdown pool, so they
+    don't inherit locks held by the parent's threads.
+
+    Returns:
+        The process pool, or None inside daemonic processes (Celery prefork
+        children) which are not allowed to start their own workers
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        if multiprocessing.current_process().daemon:
+            return None
+        with _pdf_pool_lock:
+            # parse_pdf runs in worker threads, so another may have won the race
+            if _pdf_pool is None:
+                _pdf_pool = ProcessPoolExecutor(
+                    max_workers=_pdf_pool_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info("pdf_pool_started", workers=_pdf_pool_workers)
+    return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Shut down the PDF process pool if it was started."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+def _extract_pdf_text_range(content: bytes, start: int, end: int) -> List[str]:
+    """
+    Extract the text of a range of PDF pages (runs in a worker process).
+
+    Args:
+        content: PDF file bytes
+        start: First page index
+        end: Page index to stop before
+
+    Returns:
+        Text of each page in the range, in order
+    """
+    doc = _get_fitz().open(stream=content, filetype="pdf")
+    try:
+        return [doc[page_num].get_text() for page_num in range(start, end)]
+    finally:
+        doc.close()
+
+
+def _extract_pdf_texts(doc: Any, content: bytes) -> List[str]:
+    """
+    Extract the text of every page, splitting large PDFs across processes.
+
+    Args:
+        doc: Open pymupdf document
+        content: PDF file bytes the document was opened from
+
+    Returns:
+        Text of each page, in order
+    """
+    page_count = len(doc)
+    parallel = page_count >= PDF_PARALLEL_MIN_PAGES and _pdf_pool_workers > 1
+    pool = _get_pdf_pool() if parallel else None
+    if pool is None:
+        return [page.get_text() for page in doc]
+
+    # One contiguous page range per worker, so each reopens the PDF once
+    range_size = -(-page_count // _pdf_pool_workers)
+    futures = [
+        pool.submit(_extract_pdf_text_range, content, start, min(start + range_size, page_count))
+        for start in range(0, page_count, range_size)
+    ]
+    texts = []
+    for future in futures:
+        texts.extend(future.result())
+    return texts
 
 
 def parse_pdf(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
@@ -104,10 +268,7 @@ def parse_pdf(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
     Returns:
         Dictionary with text, metadata, and optionally images
     """
-    try:
-        import fitz  # pymupdf
-    except ImportError:
-        raise DocumentParseError("pymupdf not installed. Install with: pip install pymupdf")
+    fitz = _get_fitz()
 
     result = {
         "text": "",
@@ -138,25 +299,20 @@ def parse_pdf(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
             }
 
         # Extract text from each page
-        text_parts = []
-        markdown_parts = []
+        text_parts = _extract_pdf_texts(doc, content)
 
-        for page_num, page in enumerate(doc):
-            page_text = page.get_text()
-            text_parts.append(page_text)
-
-            # Create markdown with page breaks
-            if page_num > 0:
-                markdown_parts.append("\n\n---\n\n")
-            markdown_parts.append(f"## Page {page_num + 1}\n\n{page_text}")
-
-            # Extract images if requested
-            if extract_images:
+        # Extract images if requested. Images reused across pages (logos,
+        # headers) share an xref, so each is decoded once and its bytes shared.
+        if extract_images:
+            extracted_images: Dict[int, Optional[Dict[str, Any]]] = {}
+            for page_num, page in enumerate(doc):
                 image_list = page.get_images()
                 for img_index, img in enumerate(image_list):
                     try:
                         xref = img[0]
-                        base_image = doc.extract_image(xref)
+                        if xref not in extracted_images:
+                            extracted_images[xref] = doc.extract_image(xref)
+                        base_image = extracted_images[xref]
                         if base_image:
                             image_bytes = base_image["image"]
                             image_ext = base_image["ext"]
@@ -165,7 +321,7 @@ def parse_pdf(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
                                 "page": page_num + 1,
                                 "index": img_index,
                                 "format": image_ext,
-                                "data": base64.b64encode(image_bytes).decode(),
+                                "data": image_bytes,
                                 "width": base_image.get("width"),
                                 "height": base_image.get("height")
                             })
@@ -174,7 +330,10 @@ def parse_pdf(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
                                      page=page_num, index=img_index, error=str(e))
 
         result["text"] = "\n\n".join(text_parts)
-        result["markdown"] = "".join(markdown_parts)
+        # Markdown with a heading per page and page breaks between them
+        result["markdown"] = "\n\n---\n\n".join(
+            [f"## Page {page_num + 1}\n\n{page_text}" for page_num, page_text in enumerate(text_parts)]
+        )
 
         doc.close()
 
@@ -188,6 +347,29 @@ def parse_pdf(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
         raise DocumentParseError(f"Failed to parse PDF: {str(e)}")
 
 
+def _docx_markdown_prefix(style_name: str) -> str:
+    """
+    Get the markdown prefix for a DOCX paragraph style.
+
+    Args:
+        style_name: Lowercased paragraph style name
+
+    Returns:
+        Heading or list marker (with trailing space), or "" for body text
+    """
+    if "heading 1" in style_name:
+        return "# "
+    if "heading 2" in style_name:
+        return "## "
+    if "heading 3" in style_name:
+        return "### "
+    if "heading" in style_name:
+        return "#### "
+    if "list" in style_name or "bullet" in style_name:
+        return "- "
+    return ""
+
+
 def parse_docx(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
     """
     Parse a DOCX document and extract text and metadata.
@@ -199,11 +381,7 @@ def parse_docx(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
     Returns:
         Dictionary with text, metadata, and optionally images
     """
-    try:
-        from docx import Document
-        from docx.opc.constants import RELATIONSHIP_TYPE as RT
-    except ImportError:
-        raise DocumentParseError("python-docx not installed. Install with: pip install python-docx")
+    Document = _get_docx_document()
 
     result = {
         "text": "",
@@ -236,45 +414,50 @@ def parse_docx(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
         text_parts = []
         markdown_parts = []
 
-        for para in doc.paragraphs:
+        # doc.paragraphs and doc.tables build new lists on every access
+        paragraphs = doc.paragraphs
+        tables = doc.tables
+
+        style_prefixes: Dict[Optional[str], str] = {}
+
+        for para in paragraphs:
             text = para.text.strip()
             if text:
                 text_parts.append(text)
 
-                # Convert to markdown based on style
-                style_name = para.style.name.lower() if para.style else ""
+                # Convert to markdown based on style. Resolving para.style
+                # searches the styles part on every access, so each style id
+                # is resolved to its markdown prefix once per document.
+                style_id = para._p.style
+                prefix = style_prefixes.get(style_id)
+                if prefix is None:
+                    style_name = para.style.name.lower() if para.style else ""
+                    prefix = style_prefixes[style_id] = _docx_markdown_prefix(style_name)
+                markdown_parts.append(prefix + text)
 
-                if "heading 1" in style_name:
-                    markdown_parts.append(f"# {text}")
-                elif "heading 2" in style_name:
-                    markdown_parts.append(f"## {text}")
-                elif "heading 3" in style_name:
-                    markdown_parts.append(f"### {text}")
-                elif "heading" in style_name:
-                    markdown_parts.append(f"#### {text}")
-                elif "list" in style_name or "bullet" in style_name:
-                    markdown_parts.append(f"- {text}")
-                else:
-                    markdown_parts.append(text)
-
-        result["paragraph_count"] = len(doc.paragraphs)
+        result["paragraph_count"] = len(paragraphs)
 
         # Extract tables
-        for table_num, table in enumerate(doc.tables):
+        for table_num, table in enumerate(tables):
             markdown_parts.append(f"\n**Table {table_num + 1}:**\n")
 
-            table_md = []
-            for row_num, row in enumerate(table.rows):
-                cells = [cell.text.strip() for cell in row.cells]
-                table_md.append("| " + " | ".join(cells) + " |")
+            # Build the cell grid once; row.cells rebuilds the whole table's
+            # grid on every call, which is quadratic in the row count
+            grid = table._cells
+            column_count = len(table.columns)
+
+            table_md = [
+                "| " + " | ".join(cell.text.strip() for cell in grid[start:start + column_count]) + " |"
+                for start in range(0, len(grid), column_count or 1)
+            ]
 
-                # Add header separator after first row
-                if row_num == 0:
-                    table_md.append("|" + "|".join(["---"] * len(cells)) + "|")
+            # Add header separator after first row
+            if table_md:
+                table_md.insert(1, "|" + "|".join(["---"] * column_count) + "|")
 
             markdown_parts.append("\n".join(table_md))
 
-        result["table_count"] = len(doc.tables)
+        result["table_count"] = len(tables)
 
         # Extract images if requested
         if extract_images:
@@ -290,7 +473,7 @@ def parse_docx(content: bytes, extract_images: bool = False) -> Dict[str, Any]:
 
                         result["images"].append({
                             "format": ext,
-                            "data": base64.b64encode(image_bytes).decode(),
+                            "data": image_bytes,
                             "content_type": content_type
                         })
                     except Exception as e:
@@ -337,16 +520,17 @@ async def parse_document_url(
     if not is_doc:
         raise DocumentParseError(f"Unsupported document type: {content_type}")
 
-    # Parse based on document type
+    # Parse based on document type, off the event loop so other scrapes
+    # keep running while pymupdf/python-docx work through the file
     extract_images = "media" in formats or "images" in formats
 
     if doc_type == "pdf":
-        parsed = parse_pdf(content, extract_images)
+        parsed = await asyncio.to_thread(parse_pdf, content, extract_images)
     elif doc_type in ("docx", "doc"):
         if doc_type == "doc":
             logger.warning("doc_format_limited",
                          message="Legacy .doc format has limited support, consider converting to .docx")
-        parsed = parse_docx(content, extract_images)
+        parsed = await asyncio.to_thread(parse_docx, content, extract_images)
     else:
         raise DocumentParseError(f"Unsupported document type: {doc_type}")
 
@@ -446,7 +630,7 @@ def _calculate_document_quality(parsed: Dict[str, Any]) -> float:
 
     # Check for non-garbage content (average word length)
     if words:
-        avg_word_length = sum(len(w) for w in words) / len(words)
+        avg_word_length = sum(map(len, words)) / word_count
         if 3 < avg_word_length < 12:
             score += 0.1
 
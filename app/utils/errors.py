@@ -0,0 +1,87 @@
+"""
+Error responses built from a plain dict template.
+
+Failure paths (rate limiting, validation errors, failed scrapes) can far
+outnumber successful requests under load, so error bodies skip Pydantic
+model construction and response_model validation and are encoded directly.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from slowapi.errors import RateLimitExceeded
+
+from app.utils import serialization
+
+
+def error_response(
+    code: str,
+    message: str,
+    status_code: int = 200,
+    envelope: Optional[Dict[str, Any]] = None,
+    **details: Any
+) -> Response:
+    """
+    Build a JSON error response without going through a response model.
+
+    Args:
+        code: Machine-readable error code
+        message: Human-readable error message
+        status_code: HTTP status code
+        envelope: Extra top-level fields of the endpoint's response model
+        **details: Extra fields for the error object
+
+    Returns:
+        Response with body {"success": false, "error": {"code", "message", ...}}
+    """
+    body = {
+        "success": False,
+        **(envelope or {}),
+        "error": {"code": code, "message": message, **details}
+    }
+    return Response(
+        content=serialization.dumps(body),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> Response:
+    """
+    Return request validation errors in the standard error format.
+
+    Args:
+        request: Incoming request
+        exc: Validation error raised by FastAPI
+
+    Returns:
+        422 error response listing the validation errors
+    """
+    return error_response(
+        "VALIDATION_ERROR",
+        "Invalid request",
+        status_code=422,
+        details=jsonable_encoder(exc.errors())
+    )
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
+    """
+    Return rate limit errors in the standard error format.
+
+    Mirrors slowapi's _rate_limit_exceeded_handler, including the optional
+    rate limit headers.
+
+    Args:
+        request: Incoming request
+        exc: Rate limit error raised by slowapi
+
+    Returns:
+        429 error response
+    """
+    response = error_response(
+        "RATE_LIMIT_EXCEEDED", f"Rate limit exceeded: {exc.detail}", status_code=429
+    )
+    return request.app.state.limiter._inject_headers(response, request.state.view_rate_limit)
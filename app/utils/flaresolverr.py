@@ -11,10 +11,11 @@ Usage:
     cookies = result["solution"]["cookies"]
 """
 
+from operator import itemgetter
 from typing import Dict, Any, Optional, List
-import httpx
 
 from app.config import settings
+from app.utils.http_client import get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -34,6 +35,20 @@ CLOUDFLARE_INDICATORS = [
     "_cf_bm",
 ]
 
+# (name, value) pair of a FlareSolverr cookie
+_cookie_name_value = itemgetter("name", "value")
+
+# Lowercased once for the case-insensitive scan. Plain substring checks on
+# one lowercased copy measured well ahead of a single re.IGNORECASE
+# alternation, which CPython's backtracking engine tries at every offset.
+_CLOUDFLARE_INDICATORS_LOWER = tuple(indicator.lower() for indicator in CLOUDFLARE_INDICATORS)
+
+# Challenge pages are small and carry their markers (title, challenge
+# script) near the top, so only the head of a page is scanned. This bounds
+# the cost on large pages and avoids matching the phrases in unrelated
+# content further down.
+CF_SCAN_CHARS = 16384
+
 
 def is_cloudflare_challenge(content: str) -> bool:
     """
@@ -45,11 +60,8 @@ def is_cloudflare_challenge(content: str) -> bool:
     Returns:
         True if Cloudflare protection is detected
     """
-    content_lower = content.lower()
-    for indicator in CLOUDFLARE_INDICATORS:
-        if indicator.lower() in content_lower:
-            return True
-    return False
+    head_lower = content[:CF_SCAN_CHARS].lower()
+    return any(indicator in head_lower for indicator in _CLOUDFLARE_INDICATORS_LOWER)
 
 
 class FlareSolverClient:
@@ -118,14 +130,13 @@ class FlareSolverClient:
 
         logger.info("flaresolverr_request", url=url)
 
-        async with httpx.AsyncClient(timeout=self.timeout / 1000 + 10) as client:
-            response = await client.post(
-                self.url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await get_http_client().post(
+            self.url,
+            json=payload,
+            timeout=self.timeout / 1000 + 10,
+        )
+        response.raise_for_status()
+        result = response.json()
 
         if result.get("status") == "ok":
             logger.info(
@@ -160,14 +171,13 @@ class FlareSolverClient:
 
         payload = {"cmd": "sessions.create"}
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                self.url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await get_http_client().post(
+            self.url,
+            json=payload,
+            timeout=30,
+        )
+        response.raise_for_status()
+        result = response.json()
 
         if result.get("status") == "ok":
             self._session_id = result.get("session")
@@ -196,14 +206,13 @@ class FlareSolverClient:
         payload = {"cmd": "sessions.destroy", "session": session}
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    self.url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await get_http_client().post(
+                self.url,
+                json=payload,
+                timeout=30,
+            )
+            response.raise_for_status()
+            result = response.json()
 
             if result.get("status") == "ok":
                 logger.info("flaresolverr_session_destroyed", session_id=session)
@@ -226,7 +235,7 @@ def cookies_to_dict(flaresolverr_cookies: List[Dict[str, Any]]) -> Dict[str, str
     Returns:
         Dictionary mapping cookie names to values
     """
-    return {cookie["name"]: cookie["value"] for cookie in flaresolverr_cookies}
+    return dict(map(_cookie_name_value, flaresolverr_cookies))
 
 
 def cookies_to_header(flaresolverr_cookies: List[Dict[str, Any]]) -> str:
@@ -239,9 +248,7 @@ def cookies_to_header(flaresolverr_cookies: List[Dict[str, Any]]) -> str:
     Returns:
         Cookie header string (e.g., "name1=value1; name2=value2")
     """
-    return "; ".join(
-        f"{cookie['name']}={cookie['value']}" for cookie in flaresolverr_cookies
-    )
+    return "; ".join(map("=".join, map(_cookie_name_value, flaresolverr_cookies)))
 
 
 # Global client instance
@@ -0,0 +1,64 @@
+"""
+APIRouter that includes child routers without rebuilding their routes.
+"""
+
+from enum import Enum
+from typing import List, Optional, Union
+
+from fastapi import APIRouter
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from starlette.routing import compile_path, request_response
+
+
+class FlatAPIRouter(APIRouter):
+    """
+    APIRouter whose include_router reuses the child's APIRoute objects.
+
+    FastAPI's include_router constructs a fresh APIRoute for every child
+    route, re-running dependency analysis and response field creation. The
+    route modules here are included exactly once, so their routes can be
+    re-pointed at the prefixed path and moved over as-is. Routes that didn't
+    pick a response class get this router's default_response_class.
+    """
+
+    def include_router(
+        self,
+        router: APIRouter,
+        *,
+        prefix: str = "",
+        tags: Optional[List[Union[str, Enum]]] = None,
+        **kwargs
+    ) -> None:
+        """
+        Include a router's routes under a prefix.
+
+        Args:
+            router: Router to include (its routes are taken over, not copied)
+            prefix: Path prefix for the included routes
+            tags: Tags prepended to each route's own tags
+            **kwargs: Anything else falls back to APIRouter.include_router
+        """
+        if kwargs or any(not isinstance(route, APIRoute) for route in router.routes):
+            super().include_router(router, prefix=prefix, tags=tags, **kwargs)
+            return
+
+        for route in router.routes:
+            if prefix:
+                route.path = prefix + route.path
+                route.path_regex, route.path_format, route.param_convertors = (
+                    compile_path(route.path)
+                )
+                # Keep operation ids identical to what include_router produces
+                if not route.operation_id:
+                    generate_unique_id = route.generate_unique_id_function
+                    route.unique_id = getattr(generate_unique_id, "value", generate_unique_id)(route)
+            if tags:
+                route.tags = [*tags, *route.tags]
+            if (
+                isinstance(route.response_class, DefaultPlaceholder)
+                and not isinstance(self.default_response_class, DefaultPlaceholder)
+            ):
+                route.response_class = self.default_response_class
+                route.app = request_response(route.get_route_handler())
+            self.routes.append(route)
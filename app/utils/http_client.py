@@ -0,0 +1,49 @@
+"""
+Shared httpx client for outbound HTTP requests.
+
+One pooled AsyncClient per event loop, so requests reuse keepalive
+connections instead of paying a TCP+TLS handshake per call. Don't create an
+httpx.AsyncClient per call; pass per-request options (timeout, redirects,
+headers) to the request methods instead.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+# Shared client and the loop it belongs to
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared httpx client for the running event loop.
+
+    The client is tied to the event loop it was created on. The API and
+    each Celery worker run on their own long-lived loop (see app.core.loop),
+    so the check only makes a new client when a process first uses a
+    different loop (e.g. a forked worker starting its own).
+
+    Returns:
+        httpx.AsyncClient with keepalive connection pooling
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128)
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client if it was created on the running loop."""
+    global _http_client, _http_client_loop
+    if _http_client is not None and _http_client_loop is asyncio.get_running_loop():
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
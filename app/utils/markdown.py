@@ -2,11 +2,17 @@
 HTML to Markdown conversion utilities with smart content extraction.
 """
 
+import asyncio
+import multiprocessing
 import re
-from typing import List, Optional, Dict, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Dict, Any
 
+import lxml.etree
+import lxml.html
 from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter
 
 # Try to import smart extraction libraries
 try:
@@ -21,16 +27,23 @@ try:
 except ImportError:
     FTFY_AVAILABLE = False
 
+from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.parsing import parse_html
 
 logger = get_logger(__name__)
 
+# Worker processes for CPU-bound conversion, created on first use
+_markdown_pool: Optional[ProcessPoolExecutor] = None
+_markdown_pool_lock = threading.Lock()
+
 
 # Default tags to exclude from markdown conversion
 DEFAULT_EXCLUDE_TAGS = [
     'script', 'style', 'nav', 'footer', 'header',
     'aside', 'iframe', 'noscript', 'svg'
 ]
+DEFAULT_EXCLUDE_TAG_SET = frozenset(DEFAULT_EXCLUDE_TAGS)
 
 # Additional boilerplate patterns to remove
 BOILERPLATE_PATTERNS = [
@@ -45,57 +58,88 @@ BOILERPLATE_PATTERNS = [
     r'sponsored\s*content',
 ]
 
+# All boilerplate patterns as one alternation, matched against lowercased lines
+BOILERPLATE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in BOILERPLATE_PATTERNS))
+
+# Patterns used when scoring and tidying converted markdown
+_HEADING_RE = re.compile(r'^#{1,6}\s', re.MULTILINE)
+_LIST_RE = re.compile(r'^[\-\*]\s', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# The only things ftfy changes in pure-ASCII text: HTML entities, carriage
+# returns, terminal escapes and other control characters
+_FTFY_ASCII_RE = re.compile(r'&#?[0-9A-Za-z]{1,24};|[\x00-\x08\x0b\x0d-\x1f\x7f]')
 
-def clean_html(html: str, exclude_tags: Optional[List[str]] = None) -> str:
+# Stateless converter reused for every page; links are dropped but their text kept
+_markdown_converter = MarkdownConverter(
+    heading_style="ATX",
+    bullets="-",
+    code_language="",
+    strip=['a']
+)
+
+
+def clean_html(html: str, exclude_tags: Optional[Iterable[str]] = None) -> str:
     """
-    Clean HTML by removing unwanted tags.
+    Clean HTML by removing unwanted tags and comments.
+    
+    Tags are dropped from the lxml tree before anything builds a
+    BeautifulSoup tree, so excluded subtrees (navigation menus, inline
+    scripts) never become Python objects.
     
     Args:
         html: Raw HTML content
-        exclude_tags: List of tag names to remove
+        exclude_tags: Tag names to remove
     
     Returns:
         Cleaned HTML string
     """
     if exclude_tags is None:
-        exclude_tags = DEFAULT_EXCLUDE_TAGS
+        exclude_tag_set = DEFAULT_EXCLUDE_TAG_SET
+    elif isinstance(exclude_tags, frozenset):
+        exclude_tag_set = exclude_tags
+    else:
+        exclude_tag_set = frozenset(tag.lower() for tag in exclude_tags)
     
-    soup = BeautifulSoup(html, 'lxml')
+    tree = parse_html(html)
     
-    # Remove excluded tags
-    for tag_name in exclude_tags:
-        for tag in soup.find_all(tag_name):
-            tag.decompose()
+    # Collect matches first; dropping while iterating would skip elements.
+    # drop_tree() keeps the tail text that follows each removed element.
+    for element in list(tree.iter(*exclude_tag_set, lxml.etree.Comment)):
+        element.drop_tree()
     
-    # Remove comments
-    for comment in soup.find_all(string=lambda text: isinstance(text, str) and text.strip().startswith('<!--')):
-        comment.extract()
+    return lxml.html.tostring(tree, encoding='unicode')
+
+
+def _clean_soup(html: str, exclude_tags: Optional[Iterable[str]] = None) -> BeautifulSoup:
+    """
+    Clean HTML and load it into BeautifulSoup for markdownify.
     
-    return str(soup)
+    Args:
+        html: Raw HTML content
+        exclude_tags: Tag names to remove
+    
+    Returns:
+        Cleaned BeautifulSoup tree
+    """
+    return BeautifulSoup(clean_html(html, exclude_tags), 'lxml')
 
 
-def html_to_markdown(html: str, exclude_tags: Optional[List[str]] = None) -> str:
+def html_to_markdown(html: str, exclude_tags: Optional[Iterable[str]] = None) -> str:
     """
     Convert HTML to clean markdown.
     
     Args:
         html: Raw HTML content
-        exclude_tags: List of tag names to exclude
+        exclude_tags: Tag names to exclude
     
     Returns:
         Markdown string
     """
-    # Clean HTML first
-    cleaned_html = clean_html(html, exclude_tags)
-    
-    # Convert to markdown
-    markdown = md(
-        cleaned_html,
-        heading_style="ATX",
-        bullets="-",
-        code_language="",
-        strip=['a']  # Remove links but keep text
-    )
+    # Convert the cleaned tree directly; serializing it and letting
+    # markdownify re-parse the string (with the pure-Python html.parser)
+    # would build the DOM a second time
+    markdown = _markdown_converter.convert_soup(_clean_soup(html, exclude_tags))
     
     # Clean up excessive whitespace
     lines = markdown.split('\n')
@@ -150,9 +194,13 @@ def fix_encoding(text: str) -> str:
     Returns:
         Fixed text
     """
-    if FTFY_AVAILABLE and text:
-        return ftfy.fix_text(text)
-    return text
+    if not FTFY_AVAILABLE or not text:
+        return text
+    # ASCII text can't hold mojibake, so skip ftfy unless it has something
+    # else to fix
+    if text.isascii() and not _FTFY_ASCII_RE.search(text):
+        return text
+    return ftfy.fix_text(text)
 
 
 def remove_boilerplate(text: str) -> str:
@@ -165,22 +213,11 @@ def remove_boilerplate(text: str) -> str:
     Returns:
         Cleaned text
     """
-    lines = text.split('\n')
-    cleaned_lines = []
-
-    for line in lines:
-        line_lower = line.lower()
-        is_boilerplate = False
-
-        for pattern in BOILERPLATE_PATTERNS:
-            if re.search(pattern, line_lower):
-                is_boilerplate = True
-                break
-
-        if not is_boilerplate:
-            cleaned_lines.append(line)
-
-    return '\n'.join(cleaned_lines)
+    search = BOILERPLATE_RE.search
+    return '\n'.join(
+        line for line in text.split('\n')
+        if not search(line.lower())
+    )
 
 
 def calculate_quality_score(markdown: str) -> float:
@@ -218,8 +255,8 @@ def calculate_quality_score(markdown: str) -> float:
 
     # Structure score (0-0.3)
     structure_score = 0.0
-    heading_count = len(re.findall(r'^#{1,6}\s', markdown, re.MULTILINE))
-    list_count = len(re.findall(r'^[\-\*]\s', markdown, re.MULTILINE))
+    heading_count = len(_HEADING_RE.findall(markdown))
+    list_count = len(_LIST_RE.findall(markdown))
 
     if heading_count > 0:
         structure_score += min(heading_count * 0.05, 0.15)
@@ -228,9 +265,9 @@ def calculate_quality_score(markdown: str) -> float:
     score += structure_score
 
     # Text density score (0-0.2)
-    lines = [l for l in markdown.split('\n') if l.strip()]
+    lines = list(filter(str.strip, markdown.split('\n')))
     if lines:
-        avg_line_length = sum(len(l) for l in lines) / len(lines)
+        avg_line_length = sum(map(len, lines)) / len(lines)
         if avg_line_length > 50:
             score += 0.2
         elif avg_line_length > 30:
@@ -242,7 +279,7 @@ def calculate_quality_score(markdown: str) -> float:
 
     # Readability score (0-0.2)
     word_count = len(markdown.split())
-    sentence_markers = len(re.findall(r'[.!?]', markdown))
+    sentence_markers = markdown.count('.') + markdown.count('!') + markdown.count('?')
     if sentence_markers > 0 and word_count > 0:
         avg_sentence_length = word_count / sentence_markers
         if 10 <= avg_sentence_length <= 25:
@@ -257,7 +294,7 @@ def calculate_quality_score(markdown: str) -> float:
 
 def html_to_markdown_smart(
     html: str,
-    exclude_tags: Optional[List[str]] = None,
+    exclude_tags: Optional[Iterable[str]] = None,
     use_trafilatura: bool = True
 ) -> Dict[str, Any]:
     """
@@ -268,7 +305,7 @@ def html_to_markdown_smart(
 
     Args:
         html: Raw HTML content
-        exclude_tags: List of tag names to exclude
+        exclude_tags: Tag names to exclude
         use_trafilatura: Whether to try trafilatura first
 
     Returns:
@@ -310,7 +347,7 @@ def html_to_markdown_smart(
     markdown = remove_boilerplate(markdown)
 
     # Clean up excessive whitespace
-    markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+    markdown = _BLANK_LINES_RE.sub('\n\n', markdown)
     markdown = markdown.strip()
 
     # Calculate quality score
@@ -321,3 +358,62 @@ def html_to_markdown_smart(
         "quality_score": round(quality_score, 2),
         "method": method
     }
+
+
+def _get_markdown_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the process pool used for markdown conversion, creating it on first use.
+
+    Workers are spawned rather than forked: by first use the process already
+    runs executor threads, the Playwright driver and the event loop, and a
+    forked child could inherit their locks mid-acquire.
+
+    Returns:
+        The process pool, or None inside daemonic processes (Celery prefork
+        children) which are not allowed to start their own workers
+    """
+    global _markdown_pool
+    if _markdown_pool is None:
+        if multiprocessing.current_process().daemon:
+            return None
+        with _markdown_pool_lock:
+            # Callers in other threads may have created it while we waited
+            if _markdown_pool is None:
+                workers = max(1, settings.markdown_pool_workers)
+                _markdown_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info("markdown_pool_started", workers=workers)
+    return _markdown_pool
+
+
+async def html_to_markdown_smart_async(
+    html: str,
+    exclude_tags: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Run html_to_markdown_smart off the event loop.
+
+    Conversion runs in a process pool so large pages don't stall other
+    scrapes; where a pool can't be started it falls back to a thread.
+
+    Args:
+        html: Raw HTML content
+        exclude_tags: Tag names to exclude
+
+    Returns:
+        Same dictionary as html_to_markdown_smart
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_markdown_pool(), html_to_markdown_smart, html, exclude_tags
+    )
+
+
+def shutdown_markdown_pool() -> None:
+    """Shut down the markdown process pool if it was started."""
+    global _markdown_pool
+    with _markdown_pool_lock:
+        if _markdown_pool is not None:
+            _markdown_pool.shutdown(wait=False, cancel_futures=True)
+            _markdown_pool = None
@@ -9,22 +9,38 @@ Supports:
 - CSS background-image
 """
 
+import asyncio
 import os
 import re
 import hashlib
-from typing import List, Dict, Any, Optional, Set
-from urllib.parse import urljoin, urlparse, parse_qs, unquote
+from typing import List, Dict, Any, Optional
+from urllib.parse import urljoin, urlparse, unquote, unquote_plus
 import mimetypes
 
 import httpx
-from bs4 import BeautifulSoup
+import lxml.etree
 from playwright.async_api import Page
 
 from app.config import settings
+from app.utils.http_client import get_http_client
 from app.utils.logger import get_logger
+from app.utils.parsing import ParsedPage
 
 logger = get_logger(__name__)
 
+# url(...) references in CSS
+_CSS_URL_RE = re.compile(r'url\([\'"]?([^\'")\s]+)[\'"]?\)')
+
+# Lazy-loading and responsive image attributes
+_LAZY_SRC_ATTRS = ('data-src', 'data-lazy-src', 'data-original', 'data-lazy')
+_SRCSET_ATTRS = ('srcset', 'data-srcset')
+
+# First non-empty url= query parameter of a Next.js image URL
+_NEXTJS_URL_PARAM_RE = re.compile(r'[?&]url=([^&#]+)')
+
+# Bytes read per chunk when streaming a media download to disk
+MEDIA_CHUNK_SIZE = 64 * 1024
+
 
 def extract_nextjs_image_url(url: str) -> Optional[str]:
     """
@@ -41,35 +57,28 @@ def extract_nextjs_image_url(url: str) -> Optional[str]:
     if '/_next/image' not in url:
         return None
 
-    try:
-        parsed = urlparse(url)
-        params = parse_qs(parsed.query)
-
-        if 'url' in params:
-            original_url = unquote(params['url'][0])
-            # If it's a relative URL, make it absolute using the base
-            if original_url.startswith('/'):
-                base = f"{parsed.scheme}://{parsed.netloc}"
-                return urljoin(base, original_url)
-            return original_url
-    except Exception:
-        pass
+    match = _NEXTJS_URL_PARAM_RE.search(url)
+    if match is None:
+        return None
 
-    return None
+    # Decoded as parse_qs would, then unquoted once more as before for
+    # doubly-encoded values
+    original_url = unquote(unquote_plus(match.group(1)))
+    # If it's a relative URL, make it absolute using the page's origin
+    if original_url.startswith('/'):
+        return urljoin(url, original_url)
+    return original_url
 
 
-def extract_srcset_urls(srcset: str, base_url: str) -> List[str]:
+def _split_srcset(srcset: str) -> List[str]:
     """
-    Parse srcset attribute and extract all image URLs.
-
-    Srcset format: "url1 1x, url2 2x" or "url1 100w, url2 200w"
+    Split a srcset attribute into its image URLs, as written.
 
     Args:
         srcset: The srcset attribute value
-        base_url: Base URL for resolving relative URLs
 
     Returns:
-        List of absolute URLs from the srcset
+        List of URLs from the srcset (possibly relative)
     """
     urls = []
     for item in srcset.split(','):
@@ -79,11 +88,32 @@ def extract_srcset_urls(srcset: str, base_url: str) -> List[str]:
         # URL is the first part before any space
         url = item.split()[0]
         if url:
-            urls.append(urljoin(base_url, url))
+            urls.append(url)
     return urls
 
 
-async def extract_media(page: Page, base_url: str, storage_dir: str) -> List[Dict[str, Any]]:
+def extract_srcset_urls(srcset: str, base_url: str) -> List[str]:
+    """
+    Parse srcset attribute and extract all image URLs.
+
+    Srcset format: "url1 1x, url2 2x" or "url1 100w, url2 200w"
+
+    Args:
+        srcset: The srcset attribute value
+        base_url: Base URL for resolving relative URLs
+
+    Returns:
+        List of absolute URLs from the srcset
+    """
+    return [urljoin(base_url, url) for url in _split_srcset(srcset)]
+
+
+async def extract_media(
+    page: Page,
+    base_url: str,
+    storage_dir: str,
+    parsed: Optional[ParsedPage] = None
+) -> List[Dict[str, Any]]:
     """
     Extract and download media files from a page.
 
@@ -98,21 +128,24 @@ async def extract_media(page: Page, base_url: str, storage_dir: str) -> List[Dic
         page: Playwright page
         base_url: Base URL for resolving relative URLs
         storage_dir: Directory to save media files
+        parsed: Page HTML already fetched by the scraper, to skip re-reading it
 
     Returns:
         List of media file information
     """
     logger.info("media_extraction_started", url=base_url)
 
-    # Get page HTML
-    html = await page.content()
-    soup = BeautifulSoup(html, 'lxml')
+    # Reuse the scraper's lxml tree for the page
+    if parsed is None:
+        parsed = ParsedPage(await page.content())
+    tree = parsed.tree
 
-    # Use a set to deduplicate as we go
-    media_urls: Set[str] = set()
+    # Deduplicate as we go, in discovery order. URLs that differ only in
+    # their query string (CDN cache busters, size hints) count as one.
+    media_urls: Dict[str, str] = {}
 
     def add_url(url: str):
-        """Add URL to set, handling Next.js optimization."""
+        """Add URL to the collected media, handling Next.js optimization."""
         if not url or url.startswith('data:'):
             return
 
@@ -121,83 +154,79 @@ async def extract_media(page: Page, base_url: str, storage_dir: str) -> List[Dic
         # Check if it's a Next.js optimized image and extract original
         nextjs_url = extract_nextjs_image_url(absolute_url)
         if nextjs_url:
-            media_urls.add(nextjs_url)
+            media_urls.setdefault(nextjs_url.partition('?')[0], nextjs_url)
             logger.debug("nextjs_image_extracted", original=nextjs_url)
         else:
-            media_urls.add(absolute_url)
-
-    # From <img> tags - check multiple attributes
-    for img in soup.find_all('img'):
-        # Standard src
-        if img.get('src'):
-            add_url(img.get('src'))
-
-        # Lazy loading attributes
-        for attr in ['data-src', 'data-lazy-src', 'data-original', 'data-lazy']:
-            if img.get(attr):
-                add_url(img.get(attr))
-
-        # Srcset (multiple resolutions)
-        for attr in ['srcset', 'data-srcset']:
-            if img.get(attr):
-                for url in extract_srcset_urls(img.get(attr), base_url):
-                    add_url(url)
-
-    # From <picture> and <source> elements
-    for source in soup.find_all('source'):
-        if source.get('src'):
-            add_url(source.get('src'))
-
-        for attr in ['srcset', 'data-srcset']:
-            if source.get(attr):
-                for url in extract_srcset_urls(source.get(attr), base_url):
-                    add_url(url)
-
-    # From <video> poster images
-    for video in soup.find_all('video'):
-        if video.get('poster'):
-            add_url(video.get('poster'))
-
-    # From CSS background-image (inline styles)
-    for elem in soup.find_all(style=True):
-        style = elem.get('style', '')
-        if 'url(' in style:
-            urls = re.findall(r'url\([\'"]?([^\'")\s]+)[\'"]?\)', style)
-            for url in urls:
+            media_urls.setdefault(absolute_url.partition('?')[0], absolute_url)
+
+    # One walk over the elements. An XPath union of the same selectors is
+    # far slower: libxml2 merges union node-sets pairwise.
+    for elem in tree.iter(lxml.etree.Element):
+        tag = elem.tag
+
+        if tag == 'img' or tag == 'source':
+            # Standard src (<img>, and <source> in <picture>/<video>)
+            add_url(elem.get('src'))
+
+            # Lazy loading attributes
+            if tag == 'img':
+                for attr in _LAZY_SRC_ATTRS:
+                    add_url(elem.get(attr))
+
+            # Srcset (multiple resolutions)
+            for attr in _SRCSET_ATTRS:
+                srcset = elem.get(attr)
+                if srcset:
+                    # add_url resolves each URL, so don't join them here too
+                    for url in _split_srcset(srcset):
+                        add_url(url)
+
+        elif tag == 'video':
+            # Poster images
+            add_url(elem.get('poster'))
+
+        elif tag == 'style' and elem.text:
+            # <style> blocks
+            for url in _CSS_URL_RE.findall(elem.text):
                 add_url(url)
 
-    # From <style> blocks
-    for style_tag in soup.find_all('style'):
-        if style_tag.string:
-            urls = re.findall(r'url\([\'"]?([^\'")\s]+)[\'"]?\)', style_tag.string)
-            for url in urls:
+        # CSS background-image (inline styles)
+        style = elem.get('style')
+        if style and 'url(' in style:
+            for url in _CSS_URL_RE.findall(style):
                 add_url(url)
 
-    # Convert set to list
-    media_urls_list = list(media_urls)
+    media_urls_list = list(media_urls.values())
 
     # Filter by supported formats
-    supported_formats = settings.media_formats_list
-    filtered_urls = []
-    for url in media_urls_list:
-        ext = get_file_extension(url)
-        if ext and ext.lower() in supported_formats:
-            filtered_urls.append(url)
+    # (get_file_extension already lowercases)
+    supported_formats = settings.media_formats_set
+    filtered_urls = [
+        url for url in media_urls_list
+        if get_file_extension(url) in supported_formats
+    ]
 
     logger.info("media_urls_found", total=len(media_urls_list), filtered=len(filtered_urls))
     
-    # Download media files
-    media_items = []
+    # Download media files concurrently; gather keeps the page order
     os.makedirs(storage_dir, exist_ok=True)
-    
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-        for url in filtered_urls[:50]:  # Limit to 50 files
+    semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+
+    client = get_http_client()
+
+    async def download(url: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
             try:
-                media_info = await download_media(client, url, storage_dir)
-                if media_info:
-                    media_items.append(media_info)
+                return await download_media(client, url, storage_dir)
             except Exception as e:
                 logger.warning("media_download_failed", url=url, error=str(e))
+                return None
+
+    results = await asyncio.gather(
+        *(download(url) for url in filtered_urls[:50])  # Limit to 50 files
+    )
+
+    media_items = [media_info for media_info in results if media_info]
     
     logger.info("media_extraction_completed", count=len(media_items))
     return media_items
@@ -224,7 +253,7 @@ def extract_original_filename(url: str) -> str:
 
     # If no filename found, use a hash
     if not filename or filename == '/':
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:12]
+        url_hash = hashlib.blake2b(url.encode(), digest_size=6).hexdigest()
         return f"media_{url_hash}"
 
     return filename
@@ -257,7 +286,7 @@ def sanitize_filename(filename: str, max_length: int = 200) -> str:
 
     # Ensure we have something
     if not filename:
-        return f"media_{hashlib.md5(str(id(filename)).encode()).hexdigest()[:8]}"
+        return f"media_{hashlib.blake2b(str(id(filename)).encode(), digest_size=4).hexdigest()}"
 
     # Truncate if too long (preserve extension)
     if len(filename) > max_length:
@@ -299,7 +328,7 @@ def get_unique_filepath(storage_dir: str, filename: str) -> str:
         # Safety limit
         if counter > 1000:
             # Fall back to hash
-            url_hash = hashlib.md5(f"{filename}{counter}".encode()).hexdigest()[:8]
+            url_hash = hashlib.blake2b(f"{filename}{counter}".encode(), digest_size=4).hexdigest()
             filepath = os.path.join(storage_dir, f"{name}_{url_hash}{ext}")
             break
 
@@ -310,6 +339,10 @@ async def download_media(client: httpx.AsyncClient, url: str, storage_dir: str)
     """
     Download a media file, preserving the original filename.
 
+    The body is streamed to disk in chunks, and the download is abandoned
+    (and any partial file removed) as soon as the Content-Length header or
+    the received bytes exceed max_media_size_mb.
+
     Args:
         client: HTTP client
         url: Media URL
@@ -318,51 +351,62 @@ async def download_media(client: httpx.AsyncClient, url: str, storage_dir: str)
     Returns:
         Media file information or None if failed
     """
+    real_filepath = None
     try:
-        # Download file
-        response = await client.get(url)
-        response.raise_for_status()
-
-        # Check size
-        content_length = len(response.content)
-        if content_length > settings.max_media_size_bytes:
-            logger.warning("media_too_large", url=url, size=content_length)
-            return None
-
-        # Determine MIME type
-        content_type = response.headers.get('content-type', '').split(';')[0].strip()
-        if not content_type:
-            content_type = mimetypes.guess_type(url)[0] or 'application/octet-stream'
-
-        # Extract and sanitize original filename from URL
-        original_filename = extract_original_filename(url)
-        filename = sanitize_filename(original_filename)
-
-        # Ensure proper extension
-        ext = get_file_extension(url) or guess_extension(content_type)
-        if ext:
-            # Sanitize extension
-            ext = ext.replace('/', '').replace('\\', '').replace('..', '')[:10]
-            # Add extension if missing
-            if not filename.lower().endswith(f'.{ext.lower()}'):
-                filename = f"{filename}.{ext}"
-
-        # Ensure storage directory exists and get its real path
-        os.makedirs(storage_dir, exist_ok=True)
-        real_storage_dir = os.path.realpath(storage_dir)
-
-        # Get unique filepath (handles duplicates)
-        filepath = get_unique_filepath(real_storage_dir, filename)
-        real_filepath = os.path.realpath(filepath)
-
-        # Security check: ensure the final path is within the storage directory
-        if not real_filepath.startswith(real_storage_dir + os.sep):
-            logger.warning("media_path_traversal_blocked", url=url, filepath=filepath)
-            return None
-
-        # Save file
-        with open(real_filepath, 'wb') as f:
-            f.write(response.content)
+        async with client.stream('GET', url, timeout=30.0, follow_redirects=True) as response:
+            response.raise_for_status()
+
+            # Reject oversized files before reading the body when the size is known
+            max_size = settings.max_media_size_bytes
+            declared_length = response.headers.get('content-length', '')
+            if declared_length.isdigit() and int(declared_length) > max_size:
+                logger.warning("media_too_large", url=url, size=int(declared_length))
+                return None
+
+            # Determine MIME type
+            content_type = response.headers.get('content-type', '').split(';')[0].strip()
+            if not content_type:
+                content_type = mimetypes.guess_type(url)[0] or 'application/octet-stream'
+
+            # Extract and sanitize original filename from URL
+            original_filename = extract_original_filename(url)
+            filename = sanitize_filename(original_filename)
+
+            # Ensure proper extension
+            ext = get_file_extension(url) or guess_extension(content_type)
+            if ext:
+                # Sanitize extension
+                ext = ext.replace('/', '').replace('\\', '').replace('..', '')[:10]
+                # Add extension if missing
+                if not filename.lower().endswith(f'.{ext.lower()}'):
+                    filename = f"{filename}.{ext}"
+
+            # Ensure storage directory exists and get its real path
+            os.makedirs(storage_dir, exist_ok=True)
+            real_storage_dir = os.path.realpath(storage_dir)
+
+            # Get unique filepath (handles duplicates)
+            filepath = get_unique_filepath(real_storage_dir, filename)
+            real_filepath = os.path.realpath(filepath)
+
+            # Security check: ensure the final path is within the storage directory
+            if not real_filepath.startswith(real_storage_dir + os.sep):
+                logger.warning("media_path_traversal_blocked", url=url, filepath=filepath)
+                return None
+
+            # Save file
+            content_length = 0
+            with open(real_filepath, 'wb') as f:
+                async for chunk in response.aiter_bytes(chunk_size=MEDIA_CHUNK_SIZE):
+                    content_length += len(chunk)
+                    if content_length > max_size:
+                        logger.warning("media_too_large", url=url, size=content_length)
+                        break
+                    f.write(chunk)
+
+            if content_length > max_size:
+                os.unlink(real_filepath)
+                return None
 
         # Get the actual filename used (might have counter suffix)
         final_filename = os.path.basename(real_filepath)
@@ -377,12 +421,18 @@ async def download_media(client: httpx.AsyncClient, url: str, storage_dir: str)
 
     except Exception as e:
         logger.error("media_download_error", url=url, error=str(e))
+        # Don't leave a truncated file behind
+        if real_filepath and os.path.exists(real_filepath):
+            os.unlink(real_filepath)
         return None
 
 
 def get_file_extension(url: str) -> Optional[str]:
     """
     Get file extension from URL.
+
+    Called for every candidate URL on a page, so the path is located with
+    plain string searches instead of urlparse.
     
     Args:
         url: File URL
@@ -390,20 +440,31 @@ def get_file_extension(url: str) -> Optional[str]:
     Returns:
         File extension without dot, or None
     """
-    parsed = urlparse(url)
-    path = parsed.path
-    
-    # Remove query parameters
-    if '?' in path:
-        path = path.split('?')[0]
-    
-    # Get extension
-    if '.' in path:
-        ext = path.rsplit('.', 1)[-1].lower()
-        # Remove any trailing slashes
-        ext = ext.rstrip('/')
-        return ext if ext else None
-    
+    # The path ends at the query string or fragment...
+    end = len(url)
+    for separator in '?#':
+        index = url.find(separator, 0, end)
+        if index >= 0:
+            end = index
+
+    # ...and starts after the scheme and host, if the URL has them
+    start = 0
+    authority = url.find('//', 0, end)
+    if authority >= 0:
+        start = url.find('/', authority + 2, end)
+        if start < 0:
+            return None
+    path = url[start:end].rstrip('/')
+
+    # Only the last segment counts, without any ;params
+    slash = path.rfind('/')
+    params = path.find(';', slash + 1)
+    if params >= 0:
+        path = path[:params]
+
+    dot = path.rfind('.')
+    if dot > slash:
+        return path[dot + 1:].lower() or None
     return None
 
 
@@ -0,0 +1,39 @@
+"""
+Shared HTML parsing so a page is parsed once and reused by every extractor.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import lxml.etree
+import lxml.html
+
+
+def parse_html(html: str) -> lxml.html.HtmlElement:
+    """
+    Parse HTML into an lxml document tree.
+
+    Args:
+        html: HTML content
+
+    Returns:
+        Root <html> element (empty document if the HTML can't be parsed)
+    """
+    try:
+        return lxml.html.document_fromstring(html)
+    except (lxml.etree.ParserError, ValueError):
+        return lxml.html.document_fromstring("<html></html>")
+
+
+@dataclass
+class ParsedPage:
+    """HTML for a scraped page with its lxml tree, parsed on first access."""
+    raw_html: str
+    _tree: Optional[lxml.html.HtmlElement] = field(default=None, repr=False)
+
+    @property
+    def tree(self) -> lxml.html.HtmlElement:
+        """Get the parsed document tree."""
+        if self._tree is None:
+            self._tree = parse_html(self.raw_html)
+        return self._tree
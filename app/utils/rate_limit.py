@@ -0,0 +1,72 @@
+"""
+Shared rate limiter keyed by a client IP resolved once per request.
+"""
+
+from typing import Optional
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+
+
+def _client_ip_from_scope(scope: Scope) -> str:
+    """
+    Resolve the client IP for an ASGI HTTP scope.
+
+    Args:
+        scope: ASGI connection scope
+
+    Returns:
+        First X-Forwarded-For address when forwarded headers are trusted,
+        otherwise the socket peer address
+    """
+    if settings.trust_forwarded_for:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                forwarded = value.split(b",", 1)[0].strip()
+                if forwarded:
+                    return forwarded.decode("latin-1")
+                break
+    client = scope.get("client")
+    if client and client[0]:
+        return client[0]
+    return "127.0.0.1"
+
+
+class ClientIPMiddleware:
+    """Pure ASGI middleware that stores the client IP on request.state.client_ip."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["client_ip"] = _client_ip_from_scope(scope)
+        await self.app(scope, receive, send)
+
+
+def client_ip_key(request: Request) -> str:
+    """
+    Rate limit key function.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Client IP computed by ClientIPMiddleware
+    """
+    client_ip: Optional[str] = getattr(request.state, "client_ip", None)
+    return client_ip or get_remote_address(request)
+
+
+# One limiter for every route, with counters in Redis so all API workers
+# share them; falls back to in-process counting if Redis is unreachable
+limiter = Limiter(
+    key_func=client_ip_key,
+    storage_uri=settings.redis_url,
+    strategy="moving-window",
+    in_memory_fallback_enabled=True,
+)
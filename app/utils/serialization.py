@@ -0,0 +1,106 @@
+"""
+JSON serialization helpers.
+
+Uses orjson when installed and falls back to the stdlib json module, so job
+payloads (Celery messages, stored results) skip pure-Python string escaping.
+"""
+
+import json
+from typing import Any, Dict, Iterator
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Streamed JSON is emitted in chunks of about this size, and longer strings
+# are escaped in slices of this many characters
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON bytes.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps_str(value: Any) -> str:
+    """
+    Serialize a value to a compact JSON string.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        Encoded JSON text
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON from bytes or str.
+
+    Args:
+        data: Encoded JSON
+
+    Returns:
+        Decoded value
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_pieces(obj: Dict[str, Any]) -> Iterator[bytes]:
+    """Yield the encoding of a dict piece by piece, slicing long strings."""
+    yield b"{"
+    separator = b""
+    for key, value in obj.items():
+        yield separator + dumps(key) + b":"
+        separator = b","
+        if isinstance(value, dict):
+            yield from _json_pieces(value)
+        elif isinstance(value, str) and len(value) > STREAM_CHUNK_SIZE:
+            yield b'"'
+            for start in range(0, len(value), STREAM_CHUNK_SIZE):
+                yield dumps(value[start:start + STREAM_CHUNK_SIZE])[1:-1]
+            yield b'"'
+        else:
+            yield dumps(value)
+    yield b"}"
+
+
+def iter_json(obj: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Encode a dict of JSON-compatible values incrementally.
+
+    Large string fields (page HTML/markdown, screenshots) are never encoded
+    in one piece, so no full-size encoded copy of the response is built.
+
+    Args:
+        obj: Dict to encode; nested dicts are walked, other values encoded whole
+
+    Yields:
+        JSON bytes in chunks of roughly STREAM_CHUNK_SIZE
+    """
+    buffer = bytearray()
+    for piece in _json_pieces(obj):
+        buffer += piece
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
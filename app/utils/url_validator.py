@@ -4,6 +4,8 @@ URL validation utilities to prevent SSRF attacks.
 
 import ipaddress
 import socket
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 from urllib.parse import urlparse
 
@@ -43,6 +45,13 @@ BLOCKED_HOSTNAMES = [
     'instance-data',                 # Generic cloud metadata
 ]
 
+# Host check cache: (hostname, allow_internal) -> (expires_at, is_valid, error)
+# Batch and crawl jobs hit the same hosts repeatedly, and a URL is validated
+# again before document downloads, so cache the DNS-backed verdict briefly.
+HOST_CHECK_TTL_SECONDS = 300
+HOST_CHECK_CACHE_SIZE = 4096
+_host_check_cache: "OrderedDict[Tuple[str, bool], Tuple[float, bool, Optional[str]]]" = OrderedDict()
+
 # Cloud metadata endpoints to block
 CLOUD_METADATA_IPS = [
     '169.254.169.254',  # AWS/GCP/Azure metadata
@@ -88,6 +97,65 @@ def resolve_hostname(hostname: str) -> Optional[str]:
         return None
 
 
+def check_host(hostname: str, allow_internal: bool = False) -> Tuple[bool, Optional[str]]:
+    """
+    Check a hostname for SSRF safety, resolving it if needed.
+
+    Results are cached per host for HOST_CHECK_TTL_SECONDS so repeated URLs on
+    the same host skip DNS resolution.
+
+    Args:
+        hostname: Hostname or IP address from the URL
+        allow_internal: If True, allow internal/private IPs
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    # Lowercase hostname for comparison
+    hostname_lower = hostname.lower()
+    key = (hostname_lower, allow_internal)
+    now = time.monotonic()
+
+    cached = _host_check_cache.get(key)
+    if cached and cached[0] > now:
+        _host_check_cache.move_to_end(key)
+        return cached[1], cached[2]
+
+    is_valid, error = _check_host_uncached(hostname, hostname_lower, allow_internal)
+
+    _host_check_cache[key] = (now + HOST_CHECK_TTL_SECONDS, is_valid, error)
+    _host_check_cache.move_to_end(key)
+    while len(_host_check_cache) > HOST_CHECK_CACHE_SIZE:
+        _host_check_cache.popitem(last=False)
+
+    return is_valid, error
+
+
+def _check_host_uncached(
+    hostname: str,
+    hostname_lower: str,
+    allow_internal: bool
+) -> Tuple[bool, Optional[str]]:
+    """Run the blocked-hostname and IP range checks for a host."""
+    # Check blocked hostnames
+    if hostname_lower in BLOCKED_HOSTNAMES:
+        return False, f"Blocked hostname: {hostname}"
+
+    # Check if hostname is an IP address
+    try:
+        ipaddress.ip_address(hostname)
+        if not allow_internal and is_ip_blocked(hostname):
+            return False, f"Access to internal/private IP addresses is not allowed: {hostname}"
+    except ValueError:
+        # Not an IP, it's a hostname - resolve it
+        resolved_ip = resolve_hostname(hostname)
+        if resolved_ip:
+            if not allow_internal and is_ip_blocked(resolved_ip):
+                return False, f"Hostname resolves to blocked IP: {hostname} -> {resolved_ip}"
+
+    return True, None
+
+
 def validate_url(url: str, allow_internal: bool = False) -> Tuple[bool, Optional[str]]:
     """
     Validate a URL for SSRF safety.
@@ -111,24 +179,9 @@ def validate_url(url: str, allow_internal: bool = False) -> Tuple[bool, Optional
         if not hostname:
             return False, "URL must have a hostname"
 
-        # Lowercase hostname for comparison
-        hostname_lower = hostname.lower()
-
-        # Check blocked hostnames
-        if hostname_lower in BLOCKED_HOSTNAMES:
-            return False, f"Blocked hostname: {hostname}"
-
-        # Check if hostname is an IP address
-        try:
-            ip = ipaddress.ip_address(hostname)
-            if not allow_internal and is_ip_blocked(hostname):
-                return False, f"Access to internal/private IP addresses is not allowed: {hostname}"
-        except ValueError:
-            # Not an IP, it's a hostname - resolve it
-            resolved_ip = resolve_hostname(hostname)
-            if resolved_ip:
-                if not allow_internal and is_ip_blocked(resolved_ip):
-                    return False, f"Hostname resolves to blocked IP: {hostname} -> {resolved_ip}"
+        is_valid, error = check_host(hostname, allow_internal)
+        if not is_valid:
+            return False, error
 
         # Check for common SSRF bypass attempts
         # Double-encoded characters, unusual ports, etc.
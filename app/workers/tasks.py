@@ -7,8 +7,27 @@ Includes Celery Beat configuration for scheduled tasks.
 from datetime import datetime
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
+from kombu.serialization import register
 
 from app.config import settings
+from app.utils import serialization
+
+# Batch/search results carry long markdown/HTML strings; encode them with
+# orjson when available. Plain "json" stays accepted for in-flight messages.
+if serialization.ORJSON_AVAILABLE:
+    register(
+        "orjson",
+        serialization.dumps,
+        serialization.loads,
+        content_type="application/x-orjson",
+        content_encoding="binary",
+    )
+    TASK_SERIALIZER = "orjson"
+    ACCEPT_CONTENT = ["json", "orjson"]
+else:
+    TASK_SERIALIZER = "json"
+    ACCEPT_CONTENT = ["json"]
 
 # Initialize Celery app
 celery_app = Celery(
@@ -19,9 +38,10 @@ celery_app = Celery(
 
 # Configure Celery
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer=TASK_SERIALIZER,
+    accept_content=ACCEPT_CONTENT,
+    result_serializer=TASK_SERIALIZER,
+    result_accept_content=ACCEPT_CONTENT,
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
@@ -45,6 +65,14 @@ celery_app.conf.beat_schedule = {
 }
 
 
+@worker_process_init.connect
+def start_worker_loop(**kwargs) -> None:
+    """Start the long-lived event loop each worker process runs async jobs on."""
+    from app.core.loop import start_worker_loop as _start_worker_loop
+
+    _start_worker_loop()
+
+
 @celery_app.task(name="simplecrawl.crawl")
 def crawl_task(job_id: str, url: str, config: dict) -> dict:
     """
@@ -79,7 +107,7 @@ def batch_scrape_task(job_id: str, urls: list[str], config: dict) -> dict:
         config: Scrape configuration
     
     Returns:
-        Job result dictionary
+        Job result dictionary with a summary; per-URL results are stored as BatchResult rows
     """
     # Import here to avoid circular imports
     from app.core.scraper import batch_scrape_urls
@@ -165,7 +193,8 @@ def cleanup_old_jobs_task() -> dict:
     """
     # Import here to avoid circular imports
     from datetime import timedelta
-    from app.db.models import CrawlJob, BatchJob, get_session_context
+    from sqlalchemy import delete
+    from app.db.models import CrawlJob, BatchJob, BatchResult, get_session_context
 
     deleted_crawl = 0
     deleted_batch = 0
@@ -191,6 +220,10 @@ def cleanup_old_jobs_task() -> dict:
                 BatchJob.status.in_(["completed", "failed"])
             ).all()
 
+            if old_batch:
+                db.execute(delete(BatchResult).where(
+                    BatchResult.job_id.in_([job.id for job in old_batch])
+                ))
             for job in old_batch:
                 db.delete(job)
                 deleted_batch += 1
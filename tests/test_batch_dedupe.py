@@ -0,0 +1,27 @@
+"""
+Tests for batch submission deduplication when Redis is unavailable.
+"""
+
+import pytest
+import redis.asyncio
+
+from app.api.routes import batch
+
+
+@pytest.fixture
+def unreachable_redis(monkeypatch):
+    client = redis.asyncio.from_url("redis://127.0.0.1:1/0", socket_connect_timeout=0.5)
+    monkeypatch.setattr(batch, "_redis_client", client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_claim_without_redis_lets_the_batch_through(unreachable_redis):
+    assert await batch._claim_batch("key", "batch_1") is None
+    # Nothing is remembered, so a repeat isn't deduplicated either
+    assert await batch._claim_batch("key", "batch_2") is None
+
+
+@pytest.mark.asyncio
+async def test_release_without_redis_does_not_raise(unreachable_redis):
+    await batch._release_batch("key", "batch_1")
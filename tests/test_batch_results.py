@@ -0,0 +1,89 @@
+"""
+Tests for storing batch scrape results.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+import app.core.scraper as scraper
+from app.config import settings
+from app.db.models import BatchJob, BatchResult, get_session, init_db
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'batch.db'}"
+    init_db(url)
+    monkeypatch.setattr(settings, "database_url", url)
+    return url
+
+
+def _create_job(database_url: str, job_id: str, total: int) -> None:
+    db = get_session(database_url)
+    db.add(BatchJob(id=job_id, status="pending", total=total, completed=0, failed=0))
+    db.commit()
+    db.close()
+
+
+def _stored(database_url: str, job_id: str):
+    db = get_session(database_url)
+    try:
+        job = db.get(BatchJob, job_id)
+        results = db.execute(
+            select(BatchResult.result)
+            .where(BatchResult.job_id == job_id)
+            .order_by(BatchResult.id)
+        ).scalars().all()
+        return job.status, job.completed, job.failed, list(results)
+    finally:
+        db.close()
+
+
+def test_append_batch_results_counts_and_appends(database_url):
+    _create_job(database_url, "batch_a", 3)
+    db = get_session(database_url)
+    try:
+        scraper.append_batch_results(db, "batch_a", [
+            {"url": "https://a.test/1", "success": True, "data": {"markdown": "one"}},
+            {"url": "https://a.test/2", "success": False, "error": "timeout"},
+        ])
+        scraper.append_batch_results(db, "batch_a", [
+            {"url": "https://a.test/3", "success": True, "data": {"markdown": "three"}},
+        ])
+    finally:
+        db.close()
+
+    _, completed, failed, results = _stored(database_url, "batch_a")
+    assert (completed, failed) == (2, 1)
+    assert [r["url"] for r in results] == ["https://a.test/1", "https://a.test/2", "https://a.test/3"]
+    assert results[1]["error"] == "timeout"
+    assert results[2]["data"] == {"markdown": "three"}
+
+
+def test_batch_ending_in_partial_flush_stores_everything(database_url, monkeypatch):
+    urls = [f"https://a.test/{i}" for i in range(5)]
+    _create_job(database_url, "batch_b", len(urls))
+
+    async def fake_batch(urls, config, result_sink):
+        for i, url in enumerate(urls):
+            if i % 2:
+                await result_sink({"url": url, "success": False, "error": "boom"})
+            else:
+                await result_sink({"url": url, "success": True, "data": {"markdown": url}})
+            await asyncio.sleep(0)
+        return {"total": len(urls), "completed": 3, "failed": 2}
+
+    monkeypatch.setattr(scraper, "_batch_scrape_async", fake_batch)
+    # Two full flushes of 2, then 1 result left for the final flush
+    monkeypatch.setattr(scraper, "BATCH_FLUSH_SIZE", 2)
+    monkeypatch.setattr(scraper, "BATCH_FLUSH_INTERVAL_SECONDS", 60)
+
+    summary = scraper.batch_scrape_urls("batch_b", urls, {})
+
+    status, completed, failed, results = _stored(database_url, "batch_b")
+    assert summary == {"total": 5, "completed": 3, "failed": 2}
+    assert status == "completed"
+    assert (completed, failed) == (3, 2)
+    assert [r["url"] for r in results] == urls
@@ -0,0 +1,23 @@
+"""
+Tests for media URL helpers.
+"""
+
+import pytest
+
+from app.utils.media import get_file_extension
+
+
+@pytest.mark.parametrize("url, extension", [
+    ("https://a.test/img/photo.JPG", "jpg"),
+    ("https://a.test/img/photo.png?w=100#top", "png"),
+    ("https://a.test/img/photo.webp;jsessionid=1", "webp"),
+    ("https://a.test/img/photo.png/", "png"),
+    ("/relative/image.gif", "gif"),
+    ("https://a.test/dir.v2/file", None),
+    ("https://a.test/file.", None),
+    ("https://a.test/", None),
+    ("https://a.test", None),
+    ("https://a.test/?file=photo.png", None),
+])
+def test_get_file_extension(url, extension):
+    assert get_file_extension(url) == extension
@@ -0,0 +1,65 @@
+"""
+Tests for request model validation.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.requests import (
+    BatchScrapeRequest,
+    ExtractRequest,
+    ScrapeRequest,
+    _dedupe_urls,
+)
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com",
+    "http://example.com/path?q=1#frag",
+    "HTTPS://Example.com/",
+    "https://example.com:8443/a/b",
+])
+def test_url_pattern_accepts_http_urls(url):
+    assert ScrapeRequest(url=url).url == url
+
+
+@pytest.mark.parametrize("url", [
+    "ftp://example.com/file",
+    "example.com",
+    "https://",
+    "https://exa mple.com",
+    "https://example.com/a b",
+    "javascript:alert(1)",
+])
+def test_url_pattern_rejects_other_urls(url):
+    with pytest.raises(ValidationError):
+        ScrapeRequest(url=url)
+
+
+def test_url_is_stripped():
+    assert ScrapeRequest(url="  https://example.com/  ").url == "https://example.com/"
+
+
+def test_dedupe_urls_keeps_first_seen_order():
+    assert _dedupe_urls(["b", "a", "b", "c", "a"]) == ["b", "a", "c"]
+
+
+@pytest.mark.parametrize("model", [BatchScrapeRequest, ExtractRequest])
+def test_urls_deduped_after_stripping(model):
+    request = model(urls=[" https://a.test", "https://a.test", "https://b.test "])
+    assert request.urls == ["https://a.test", "https://b.test"]
+
+
+def test_batch_cache_key_matches_for_identical_requests():
+    first = BatchScrapeRequest(urls=["https://a.test", " https://a.test"], formats=["markdown"])
+    second = BatchScrapeRequest(urls=["https://a.test"], formats=["markdown"])
+    assert first.cache_key == second.cache_key
+
+
+def test_batch_cache_key_depends_on_options():
+    base = BatchScrapeRequest(urls=["https://a.test"])
+    assert base.cache_key != BatchScrapeRequest(urls=["https://a.test"], formats=["html"]).cache_key
+    assert base.cache_key != BatchScrapeRequest(
+        urls=["https://a.test"], screenshot_format="jpeg"
+    ).cache_key
+    assert base.cache_key != BatchScrapeRequest(urls=["https://b.test"]).cache_key
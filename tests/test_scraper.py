@@ -0,0 +1,36 @@
+"""
+Tests for scraper helpers that don't need a browser.
+"""
+
+from app.core.scraper import _looks_rendered
+from app.utils.parsing import ParsedPage
+
+ARTICLE_TEXT = "Plenty of server-rendered text. " * 20
+
+
+def test_server_rendered_page_looks_rendered():
+    html = f"<html><body><article><h1>Title</h1><p>{ARTICLE_TEXT}</p></article></body></html>"
+    assert _looks_rendered(ParsedPage(html))
+
+
+def test_empty_app_root_needs_browser():
+    html = "<html><body><div id='root'></div><script src='/app.js'></script></body></html>"
+    assert not _looks_rendered(ParsedPage(html))
+
+
+def test_whitespace_only_app_root_needs_browser():
+    assert not _looks_rendered(ParsedPage("<html><body><div id='__next'>  </div></body></html>"))
+
+
+def test_inline_script_text_is_not_counted():
+    state = '{"key": "value"}' * 500
+    html = (
+        "<html><body><p>Loading</p>"
+        f"<script id='__NEXT_DATA__' type='application/json'>{state}</script>"
+        "</body></html>"
+    )
+    assert not _looks_rendered(ParsedPage(html))
+
+
+def test_empty_document_needs_browser():
+    assert not _looks_rendered(ParsedPage(""))